@@ -0,0 +1,89 @@
+"""In-memory response cache: bounded LRU with per-entry TTL for repeated summarize requests."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Iterable
+
+# Default: 512 summaries kept for 24h
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 86_400.0
+
+
+class TTLCache:
+    """Bounded LRU mapping with per-entry expiry and an optional total size budget.
+
+    Least recently used entries are evicted when maxsize entries are exceeded or, with maxbytes
+    set, when the sizes given to put() add up to more than maxbytes; entries older than ttl
+    seconds are treated as missing. Not thread-safe: use from the event loop.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        maxbytes: int | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._data: OrderedDict[str, tuple[float, Any, int]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for key, or None if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value, size = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.nbytes -= size
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any, size: int = 0) -> None:
+        """Store value under key (size counts against maxbytes), evicting least recently used entries."""
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[2]
+        self._data[key] = (time.monotonic() + self.ttl, value, size)
+        self.nbytes += size
+        while len(self._data) > self.maxsize or (self.maxbytes is not None and self.nbytes > self.maxbytes):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.nbytes -= evicted_size
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._data.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def content_key(items: Iterable[tuple[str, str]], *extra: str) -> str:
+    """Build a stable cache key from (path, content) pairs plus optional extra parts.
+
+    Order-independent (pairs are sorted by path). Each content is hashed on its own
+    so no separator inside a file can make two different repos collide.
+
+    Args:
+        items: (path, content) pairs, e.g. from fetched RepoFile objects.
+        extra: Extra key parts that change the result (e.g. model name).
+
+    Returns:
+        Hex digest (32 chars).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in extra:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    for path, content in sorted(items, key=lambda item: item[0]):
+        h.update(path.encode("utf-8"))
+        h.update(b"\0")
+        h.update(hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest())
+    return h.hexdigest()
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
-from pydantic import SecretStr
+from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Resolve .env from project root (parent of summary_api) so it loads regardless of cwd
@@ -28,12 +29,16 @@ class Settings(BaseSettings):
     # Max tokens for LLM response (summary + technologies + structure). Default 4096; increase if response is truncated.
     NEBIUS_MAX_TOKENS: int = 4096
 
+    # Max /summarize requests processed concurrently; extra requests wait for a slot.
+    MAX_CONCURRENT_SUMMARIES: int = Field(default=8, ge=1)
+
     # Optional: GitHub token for higher API rate limit (5000/h vs 60/h). Set GITHUB_TOKEN to run real integration tests.
     GITHUB_TOKEN: SecretStr = SecretStr("")
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Return application settings (env-based)."""
+    """Return application settings (env-based), loaded once per process."""
     return Settings()
 
 
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
-from dataclasses import dataclass
-from typing import List
+from typing import Any, Callable, List
 
 import httpx
-from circuitbreaker import circuit
+from circuitbreaker import CircuitBreaker
 from tenacity import (
     retry,
     retry_if_exception,
@@ -15,10 +15,21 @@ from tenacity import (
     wait_random_exponential,
 )
 
+from .cache import TTLCache
+from .models import RepoFile
+
 # Default timeout for GitHub API and content requests
 DEFAULT_TIMEOUT = 30.0
+# HEAD revision lookup is a best-effort cache probe: a slow GitHub falls back to the full fetch quickly
+REVISION_TIMEOUT = 3.0
 # Max files to fetch to avoid excessive requests and rate limits
 DEFAULT_MAX_FILES = 500
+# Per-file download cap: bodies are streamed and reading stops here (context keeps ~20k chars per file)
+MAX_FILE_BYTES = 256 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Max concurrent file downloads; stays clear of GitHub secondary rate limits. Process-wide when the
+# caller passes one shared download_limit (the app does), else per fetch_repo_files call
+DOWNLOAD_CONCURRENCY = 16
 # Retry: 3 attempts, exponential backoff 1–60s with jitter
 RETRY_ATTEMPTS = 3
 RETRY_MIN_WAIT = 1
@@ -27,13 +38,21 @@ RETRY_MAX_WAIT = 60
 # GitHub API base (no auth required for public repos)
 GITHUB_API_BASE = "https://api.github.com"
 
+# Shared client: bounded keep-alive pool, tight connect timeout (no handshake per request)
+SHARED_CLIENT_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0
+)
+SHARED_CLIENT_TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0)
+USER_AGENT = "summary-api"
+# Media type that makes GET /repos/{owner}/{repo}/commits/{ref} return just the SHA as text
+SHA_MEDIA_TYPE = "application/vnd.github.sha"
 
-@dataclass
-class RepoFile:
-    """A single file in the repository: path (relative to repo root) and decoded content."""
-
-    path: str
-    content: str
+# url -> (ETag, parsed JSON or decoded text): repeat GETs send If-None-Match; a 304 reuses the
+# stored body and does not count against the GitHub rate limit. Bounded by entry count and by the
+# total of raw body bytes as received (least recently used entries go first). Event-loop only.
+ETAG_CACHE_MAX_ENTRIES = 4096
+ETAG_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_etag_cache = TTLCache(maxsize=ETAG_CACHE_MAX_ENTRIES, maxbytes=ETAG_CACHE_MAX_BYTES)
 
 
 class GitHubClientError(Exception):
@@ -49,6 +68,30 @@ class GitHubClientError(Exception):
         super().__init__(message)
 
 
+# Guards fetch_repo_files: opens after 5 failures and blocks for 60s before half-open.
+# A named instance so fetch_repo_revision can skip GitHub entirely while it is open.
+_fetch_circuit = CircuitBreaker(
+    failure_threshold=5,
+    recovery_timeout=60,
+    expected_exception=GitHubClientError,
+    name="github_fetch_repo_files",
+)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the shared AsyncClient for GitHub requests (HTTP/2, keep-alive pool).
+
+    Owned by the app lifespan and passed to fetch_repo_files so connections are
+    reused across requests. The caller must close it with aclose().
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=SHARED_CLIENT_LIMITS,
+        timeout=SHARED_CLIENT_TIMEOUT,
+        headers={"User-Agent": USER_AGENT},
+    )
+
+
 def _is_github_transient(exc: BaseException) -> bool:
     """Return True if the exception is a transient GitHub error (retryable)."""
     return isinstance(exc, GitHubClientError) and getattr(exc, "is_transient", False)
@@ -85,31 +128,165 @@ def _parse_github_url(github_url: str) -> tuple[str, str]:
     return owner, repo
 
 
+def _auth_headers(github_token: str | None) -> dict[str, str]:
+    """Return request headers with a Bearer token if one is set."""
+    headers: dict[str, str] = {}
+    if github_token and github_token.strip():
+        headers["Authorization"] = f"Bearer {github_token.strip()}"
+    return headers
+
+
+async def _conditional_get(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict[str, str],
+    decode: Callable[[httpx.Response], Any],
+    timeout: float | None = None,
+) -> Any:
+    """GET url and return decode(response), revalidating a previously seen body with If-None-Match.
+
+    Only the decoded value is kept (not the Response), charged at the raw body size; a 304
+    Not Modified returns it without decoding again. Raises httpx.HTTPStatusError on non-2xx.
+    timeout overrides the client's timeout for this request only.
+    """
+    cached = _etag_cache.get(url)
+    if cached is not None:
+        headers = {**headers, "If-None-Match": cached[0]}
+    request_kwargs = {} if timeout is None else {"timeout": timeout}
+    resp = await client.get(url, headers=headers, **request_kwargs)
+    if resp.status_code == 304 and cached is not None:
+        return cached[1]
+    resp.raise_for_status()
+    value = decode(resp)
+    etag = resp.headers.get("etag")
+    if etag and resp.status_code == 200:
+        _etag_cache.put(url, (etag, value), size=len(resp.content))
+    return value
+
+
+async def fetch_repo_revision(
+    github_url: str,
+    *,
+    timeout: float = REVISION_TIMEOUT,
+    github_token: str | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> str | None:
+    """Resolve the repo's default-branch HEAD to a revision id "owner/repo@sha" with one cheap request.
+
+    Best effort: used as a cache key before the full fetch, so any failure (invalid URL,
+    not found, rate limit, network, timeout) returns None and leaves error reporting to fetch_repo_files.
+    While the fetch_repo_files circuit is open no request is sent: the fetch fails fast anyway.
+
+    Args:
+        github_url: Full URL of the repo, e.g. https://github.com/owner/repo
+        timeout: Request timeout in seconds; short by default, also on a shared client.
+        github_token: Optional GitHub token for higher rate limit (5000/h).
+        client: Shared AsyncClient (see create_http_client). If None, a client is
+            created for this call and closed afterwards.
+
+    Returns:
+        "owner/repo@sha" with owner/repo lowercased, or None if it could not be resolved.
+    """
+    try:
+        owner, repo = _parse_github_url(github_url)
+    except GitHubClientError:
+        return None
+    if _fetch_circuit.opened:
+        return None
+    headers = _auth_headers(github_token)
+    headers["Accept"] = SHA_MEDIA_TYPE
+    owns_client = client is None
+    if client is None:
+        client = httpx.AsyncClient(timeout=timeout)
+    try:
+        sha = await _conditional_get(
+            client,
+            f"{GITHUB_API_BASE}/repos/{owner}/{repo}/commits/HEAD",
+            headers,
+            lambda resp: resp.text.strip(),
+            timeout=timeout,
+        )
+    except httpx.HTTPError:
+        return None
+    finally:
+        if owns_client:
+            await client.aclose()
+    if not re.fullmatch(r"[0-9a-f]{40}(?:[0-9a-f]{24})?", sha):
+        return None
+    return f"{owner.lower()}/{repo.lower()}@{sha}"
+
+
+def _is_binary_content_type(content_type: str) -> bool:
+    """Return True for octet-stream/image responses that do not declare a charset or text type."""
+    if "charset" in content_type or "text" in content_type or not content_type:
+        return False
+    return "application/octet-stream" in content_type or "image/" in content_type
+
+
 async def _get_file_content(
-    client: httpx.AsyncClient, download_url: str | None
+    client: httpx.AsyncClient, download_url: str | None, headers: dict[str, str]
 ) -> str | None:
-    """Fetch raw file content from download_url. Returns None if binary or error."""
+    """Fetch raw file content from download_url. Returns None if binary or error.
+
+    The body is streamed and reading stops at MAX_FILE_BYTES (process_repo_files truncates far
+    below that), so one huge file never sits in memory; binary types are rejected before any
+    body bytes are read. Revalidated with If-None-Match like _conditional_get.
+    """
     if not download_url:
         return None
+    cached = _etag_cache.get(download_url)
+    if cached is not None:
+        headers = {**headers, "If-None-Match": cached[0]}
     try:
-        resp = await client.get(download_url)
-        resp.raise_for_status()
-        content_type = resp.headers.get("content-type", "")
-        if "charset" in content_type or "text" in content_type or not content_type:
-            try:
-                return resp.text
-            except Exception:
+        async with client.stream("GET", download_url, headers=headers) as resp:
+            if resp.status_code == 304 and cached is not None:
+                return cached[1]
+            resp.raise_for_status()
+            if _is_binary_content_type(resp.headers.get("content-type", "")):
                 return None
-        if "application/octet-stream" in content_type or "image/" in content_type:
-            return None
-        try:
-            return resp.text
-        except Exception:
-            return None
+            body = bytearray()
+            async for chunk in resp.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                body += chunk
+                if len(body) >= MAX_FILE_BYTES:
+                    del body[MAX_FILE_BYTES:]
+                    break
+            text = body.decode(resp.charset_encoding or "utf-8", errors="replace")
+            etag = resp.headers.get("etag")
+            if etag and resp.status_code == 200:
+                _etag_cache.put(download_url, (etag, text), size=len(body))
+            return text
     except Exception:
         return None
 
 
+async def _download_files(
+    client: httpx.AsyncClient,
+    items: List[tuple[str, dict]],
+    files: List[RepoFile],
+    max_files: int,
+    headers: dict[str, str],
+    limit: asyncio.Semaphore,
+) -> None:
+    """Download (path, item) files concurrently and append them in listing order, up to max_files.
+
+    Downloads run in slices no larger than the remaining file budget, so the files kept are
+    exactly those a sequential fetch would keep (binary/failed downloads do not count).
+    """
+
+    async def _one(item: dict) -> str | None:
+        async with limit:
+            return await _get_file_content(client, item.get("download_url"), headers)
+
+    start = 0
+    while start < len(items) and len(files) < max_files:
+        batch = items[start:start + max_files - len(files)]
+        start += len(batch)
+        contents = await asyncio.gather(*(_one(item) for _, item in batch))
+        for (item_path, _), content in zip(batch, contents):
+            if content is not None:
+                files.append(RepoFile(path=item_path, content=content))
+
+
 async def _fetch_contents_recurse(
     client: httpx.AsyncClient,
     owner: str,
@@ -117,8 +294,10 @@ async def _fetch_contents_recurse(
     path: str,
     files: List[RepoFile],
     max_files: int,
+    headers: dict[str, str],
+    limit: asyncio.Semaphore,
 ) -> None:
-    """List contents at path; for each file fetch content and append; for each dir recurse."""
+    """List contents at path; download runs of files concurrently and recurse into dirs in listing order."""
     if len(files) >= max_files:
         return
     url = (
@@ -126,26 +305,26 @@ async def _fetch_contents_recurse(
         if path
         else f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents"
     )
-    resp = await client.get(url)
-    resp.raise_for_status()
-    data = resp.json()
+    data = await _conditional_get(client, url, headers, lambda resp: resp.json())
     if not isinstance(data, list):
         item = data
         if item.get("type") == "file":
-            content = await _get_file_content(client, item.get("download_url"))
+            content = await _get_file_content(client, item.get("download_url"), headers)
             if content is not None:
                 files.append(RepoFile(path=item.get("path", path), content=content))
         return
+    pending: List[tuple[str, dict]] = []
     for item in data:
-        if len(files) >= max_files:
-            return
         name = item.get("name") or ""
         item_path = item.get("path") or (f"{path}/{name}".lstrip("/") if path else name)
         if item.get("type") == "file":
-            content = await _get_file_content(client, item.get("download_url"))
-            if content is not None:
-                files.append(RepoFile(path=item_path, content=content))
+            pending.append((item_path, item))
         elif item.get("type") == "dir":
+            # Files listed before this dir come first, as in a sequential walk
+            await _download_files(client, pending, files, max_files, headers, limit)
+            pending = []
+            if len(files) >= max_files:
+                return
             await _fetch_contents_recurse(
                 client=client,
                 owner=owner,
@@ -153,10 +332,13 @@ async def _fetch_contents_recurse(
                 path=item_path,
                 files=files,
                 max_files=max_files,
+                headers=headers,
+                limit=limit,
             )
+    await _download_files(client, pending, files, max_files, headers, limit)
 
 
-@circuit(failure_threshold=5, recovery_timeout=60, expected_exception=GitHubClientError)
+@_fetch_circuit
 @retry(
     retry=retry_if_exception(_is_github_transient),
     stop=stop_after_attempt(RETRY_ATTEMPTS),
@@ -169,10 +351,13 @@ async def fetch_repo_files(
     timeout: float = DEFAULT_TIMEOUT,
     max_files: int = DEFAULT_MAX_FILES,
     github_token: str | None = None,
+    client: httpx.AsyncClient | None = None,
+    download_limit: asyncio.Semaphore | None = None,
 ) -> List[RepoFile]:
     """Fetch list of files with content from a public GitHub repository (async).
 
-    Uses GitHub Contents API with async httpx. Transient errors (rate limit, timeout,
+    Uses GitHub Contents API with async httpx; files within a directory are downloaded
+    concurrently, at most download_limit at a time. Transient errors (rate limit, timeout,
     network) are retried with exponential backoff and jitter. Circuit breaker opens
     after 5 failures and blocks for 60s before half-open.
 
@@ -181,6 +366,10 @@ async def fetch_repo_files(
         timeout: Request timeout in seconds.
         max_files: Maximum number of files to fetch.
         github_token: Optional GitHub token for higher rate limit (5000/h).
+        client: Shared AsyncClient (see create_http_client). If None, a client is
+            created for this call and closed afterwards; timeout applies only then.
+        download_limit: Semaphore shared by all fetches so concurrent requests together stay under
+            it. If None, this call gets its own Semaphore(DOWNLOAD_CONCURRENCY).
 
     Returns:
         List of RepoFile (path, content). Paths are relative to repo root.
@@ -190,11 +379,14 @@ async def fetch_repo_files(
             error after retries. is_transient True for retryable errors.
     """
     owner, repo = _parse_github_url(github_url)
-    headers: dict[str, str] = {}
-    if github_token and github_token.strip():
-        headers["Authorization"] = f"Bearer {github_token.strip()}"
+    headers = _auth_headers(github_token)
     files: List[RepoFile] = []
-    async with httpx.AsyncClient(timeout=timeout, headers=headers or None) as client:
+    if download_limit is None:
+        download_limit = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    owns_client = client is None
+    if client is None:
+        client = httpx.AsyncClient(timeout=timeout)
+    try:
         try:
             await _fetch_contents_recurse(
                 client=client,
@@ -203,6 +395,8 @@ async def fetch_repo_files(
                 path="",
                 files=files,
                 max_files=max_files,
+                headers=headers,
+                limit=download_limit,
             )
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
@@ -226,4 +420,7 @@ async def fetch_repo_files(
             raise GitHubClientError("Request to GitHub timed out", is_transient=True) from e
         except httpx.RequestError as e:
             raise GitHubClientError(f"Network error: {e!s}", is_transient=True) from e
+    finally:
+        if owns_client:
+            await client.aclose()
     return files
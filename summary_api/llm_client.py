@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
@@ -23,10 +24,19 @@ NEBIUS_BASE_URL = "https://api.tokenfactory.nebius.com/v1"
 NEBIUS_MODEL = "meta-llama/Llama-3.3-70B-Instruct"
 
 DEFAULT_TIMEOUT = 120.0
+# Connection warm-up is best effort; never hold a request back for long
+WARM_UP_TIMEOUT = 5.0
 DEFAULT_MAX_TOKENS = 4096
 RETRY_ATTEMPTS = 3
 RETRY_MIN_WAIT = 1
 RETRY_MAX_WAIT = 60
+# Greedy decoding + fixed seed: same context always yields the same summary (cacheable)
+TEMPERATURE = 0.0
+SEED = 42
+# Shared client pool: a few long-lived connections to one provider host
+SHARED_CLIENT_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+# Max concurrent chat/completions calls when summarizing several repos at once
+DEFAULT_BATCH_CONCURRENCY = 4
 
 # Prompt asks for structured JSON so we can parse summary, technologies, structure
 SYSTEM_PROMPT = """You are a technical writer. Given repository file contents and structure, produce a short summary in the exact JSON format below. Use only the keys "summary", "technologies", and "structure". No other keys or markdown code fences.
@@ -38,6 +48,10 @@ USER_PROMPT_TEMPLATE = """Summarize this repository based on the following conte
 
 {context}
 """
+# Template split once at import: building the user message is two concatenations, no str.format parse
+_USER_PROMPT_HEAD, _, _USER_PROMPT_TAIL = USER_PROMPT_TEMPLATE.partition("{context}")
+# Shared by every request and never mutated; a plain dict because httpx's json= encoder rejects mappingproxy
+_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
 
 
 class LLMClientError(Exception):
@@ -53,16 +67,51 @@ class LLMClientError(Exception):
         super().__init__(message)
 
 
+def create_http_client(api_key: str | None = None) -> httpx.AsyncClient:
+    """Create the shared AsyncClient for LLM API calls (HTTP/2, keep-alive pool).
+
+    Owned by the app lifespan and passed to summarize_repo so the TLS connection
+    to the provider is reused across requests. With api_key, the Authorization
+    header is bound to the client once instead of being merged into every request.
+    The caller must close it with aclose().
+
+    Args:
+        api_key: Optional provider key (NEBIUS_API_KEY) to bind as a default header.
+    """
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
+    return httpx.AsyncClient(
+        http2=True,
+        limits=SHARED_CLIENT_LIMITS,
+        timeout=DEFAULT_TIMEOUT,
+        headers=headers,
+    )
+
+
+async def warm_up(client: httpx.AsyncClient, base_url: str | None = None) -> None:
+    """Open (or refresh) a pooled connection to the LLM API so the next call skips the handshake.
+
+    Sends a HEAD to the API base URL; the status is irrelevant. Never raises.
+
+    Args:
+        client: Shared client from create_http_client().
+        base_url: Override API base URL (default NEBIUS_BASE_URL).
+    """
+    try:
+        await client.head(base_url or NEBIUS_BASE_URL, timeout=WARM_UP_TIMEOUT)
+    except Exception:
+        logger.debug("LLM connection warm-up failed", exc_info=True)
+
+
 def _is_llm_transient(exc: BaseException) -> bool:
     """Return True if the exception is a transient LLM error (retryable)."""
     return isinstance(exc, LLMClientError) and getattr(exc, "is_transient", False)
 
 
 def _build_messages(context: str) -> list[dict[str, str]]:
-    """Build chat messages for OpenAI-compatible (Nebius) completion request."""
+    """Build chat messages for OpenAI-compatible (Nebius) completion request (system message is shared)."""
     return [
-        {"role": "system", "content": SYSTEM_PROMPT},
-        {"role": "user", "content": USER_PROMPT_TEMPLATE.format(context=context)},
+        _SYSTEM_MESSAGE,
+        {"role": "user", "content": _USER_PROMPT_HEAD + context + _USER_PROMPT_TAIL},
     ]
 
 
@@ -103,7 +152,7 @@ def _parse_structured_response(content: str) -> dict[str, Any]:
 
     if not isinstance(technologies, list):
         technologies = []
-    technologies = [t for t in technologies if isinstance(t, str)]
+    technologies = list(filter(str.__instancecheck__, technologies))
 
     if structure is None:
         structure = ""
@@ -120,6 +169,7 @@ async def _call_nebius(
     model: str,
     timeout: float,
     max_tokens: int,
+    client: httpx.AsyncClient | None = None,
 ) -> dict[str, Any]:
     """Call Nebius Token Factory (OpenAI-compatible) chat/completions API (async)."""
     messages = _build_messages(context)
@@ -133,16 +183,24 @@ async def _call_nebius(
         ),
     )
     url = base_url.rstrip("/") + "/chat/completions"
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    auth = f"Bearer {api_key}"
     payload = {
         "model": model,
         "messages": messages,
         "max_tokens": max_tokens,
-        "temperature": 0.3,
+        "temperature": TEMPERATURE,
+        "seed": SEED,
         "response_format": {"type": "json_object"},
     }
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.post(url, json=payload, headers=headers)
+    if client is not None:
+        # Skip the per-request header merge when the client was created with this key
+        headers = None if client.headers.get("Authorization") == auth else {"Authorization": auth}
+        response = await client.post(url, json=payload, headers=headers, timeout=timeout)
+    else:
+        async with httpx.AsyncClient(timeout=timeout) as own_client:
+            response = await own_client.post(
+                url, json=payload, headers={"Authorization": auth, "Content-Type": "application/json"}
+            )
 
     if response.status_code == 401:
         raise LLMClientError(
@@ -213,11 +271,14 @@ async def summarize_repo(
     model: str | None = None,
     timeout: float = DEFAULT_TIMEOUT,
     max_tokens: int = DEFAULT_MAX_TOKENS,
+    client: httpx.AsyncClient | None = None,
 ) -> dict[str, Any]:
     """Call the LLM API to summarize repository context (async, with retry and circuit breaker).
 
     Transient errors (429, 5xx, timeout, network) are retried with exponential backoff
     and jitter. Circuit breaker opens after 5 failures, 60s recovery timeout.
+    Sampling is deterministic (temperature 0, fixed seed), so the same context
+    yields the same summary and results are safe to cache.
 
     Args:
         context: Prepared repo context string (from repo_processor).
@@ -226,6 +287,8 @@ async def summarize_repo(
         model: Override model ID (default NEBIUS_MODEL).
         timeout: Request timeout in seconds.
         max_tokens: Max tokens to generate.
+        client: Shared AsyncClient (see create_http_client). If None, a client is
+            created for this call and closed afterwards.
 
     Returns:
         Dict with keys: summary (str), technologies (list[str]), structure (str).
@@ -247,7 +310,7 @@ async def summarize_repo(
 
     try:
         return await _call_nebius(
-            context, api_key, base_url, model, timeout, max_tokens
+            context, api_key, base_url, model, timeout, max_tokens, client
         )
     except httpx.TimeoutException as e:
         raise LLMClientError(
@@ -257,3 +320,61 @@ async def summarize_repo(
         raise LLMClientError(
             f"LLM API network error: {e}", is_transient=True
         ) from e
+
+
+async def summarize_repos(
+    contexts: list[str],
+    *,
+    api_key: str,
+    base_url: str | None = None,
+    model: str | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    client: httpx.AsyncClient | None = None,
+) -> list[dict[str, Any]]:
+    """Summarize several repository contexts concurrently (async).
+
+    Each context goes through summarize_repo (same retry and circuit breaker);
+    calls run in parallel, capped by a semaphore so a large batch does not
+    trip the provider rate limit. Calls run in a TaskGroup: the first failure
+    cancels the calls still running or waiting for the semaphore.
+
+    Args:
+        contexts: Prepared repo context strings (from repo_processor).
+        api_key: API key from config (NEBIUS_API_KEY), never hardcoded.
+        base_url: Override API base URL (default NEBIUS_BASE_URL).
+        model: Override model ID (default NEBIUS_MODEL).
+        timeout: Request timeout in seconds, per call.
+        max_tokens: Max tokens to generate, per call.
+        max_concurrency: Max chat/completions calls in flight at once.
+        client: Shared AsyncClient; calls are multiplexed over its connection pool.
+
+    Returns:
+        One dict per context, in the same order as contexts, each with keys
+        summary (str), technologies (list[str]), structure (str).
+
+    Raises:
+        LLMClientError: If any call fails after retries (first failure is raised).
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _one(context: str) -> dict[str, Any]:
+        async with semaphore:
+            return await summarize_repo(
+                context,
+                api_key=api_key,
+                base_url=base_url,
+                model=model,
+                timeout=timeout,
+                max_tokens=max_tokens,
+                client=client,
+            )
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(_one(c)) for c in contexts]
+    except ExceptionGroup as eg:
+        # Keep the single-exception contract; the rest were cancelled, not failed
+        raise eg.exceptions[0] from None
+    return [task.result() for task in tasks]
@@ -2,15 +2,26 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import multiprocessing
+import os
+import re
 import time
-import uuid
-from contextlib import asynccontextmanager
-
-from fastapi import FastAPI, Response
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, nullcontext
+from contextvars import ContextVar
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, Coroutine, NamedTuple
+
+import httpx
+import orjson
+from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import Response, StreamingResponse
 
 logging.getLogger("summary_api.llm_client").setLevel(logging.INFO)
 
@@ -21,103 +32,352 @@ except ImportError:
 
 try:
     from .audit import error_detail_from_exception, log_audit, log_audit_step
+    from .cache import TTLCache, content_key
     from .config import get_env_file_path, get_settings
     from .dlq import write_to_dlq
-    from .github_client import GitHubClientError, RepoFile, fetch_repo_files
-    from .llm_client import LLMClientError, summarize_repo
-    from .repo_processor import process_repo_files
+    from .github_client import (
+        DOWNLOAD_CONCURRENCY,
+        GitHubClientError,
+        RepoFile,
+        create_http_client,
+        fetch_repo_files,
+        fetch_repo_revision,
+    )
+    from .llm_client import LLMClientError, summarize_repo, warm_up
+    from .llm_client import create_http_client as create_llm_http_client
+    from .repo_processor import process_repo_files, trim_repo_files
     from .schemas import ErrorResponse, SummarizeRequest, SummarizeResponse
 except ImportError:
     from summary_api.audit import error_detail_from_exception, log_audit, log_audit_step
+    from summary_api.cache import TTLCache, content_key
     from summary_api.config import get_env_file_path, get_settings
     from summary_api.dlq import write_to_dlq
-    from summary_api.github_client import GitHubClientError, RepoFile, fetch_repo_files
-    from summary_api.llm_client import LLMClientError, summarize_repo
-    from summary_api.repo_processor import process_repo_files
+    from summary_api.github_client import (
+        DOWNLOAD_CONCURRENCY,
+        GitHubClientError,
+        RepoFile,
+        create_http_client,
+        fetch_repo_files,
+        fetch_repo_revision,
+    )
+    from summary_api.llm_client import LLMClientError, summarize_repo, warm_up
+    from summary_api.llm_client import create_http_client as create_llm_http_client
+    from summary_api.repo_processor import process_repo_files, trim_repo_files
     from summary_api.schemas import ErrorResponse, SummarizeRequest, SummarizeResponse
 
 @asynccontextmanager
-async def _lifespan(_app: FastAPI):  # noqa: ARG001
-    """Startup: configure logging and log LLM config. Shutdown: none."""
+async def _lifespan(_app: FastAPI):
+    """Startup: configure logging, log LLM config, open shared GitHub/LLM clients (preconnecting to the LLM API
+    when a key is set) and the shared GitHub download limit, CPU pool, start audit writer.
+
+    Shutdown: cancel in-flight summarize runs, flush queued audit entries, then close the HTTP clients and the CPU pool.
+    """
     _configure_structured_logging()
-    settings = get_settings()
     env_path = get_env_file_path()
-    nebius_set = bool((settings.NEBIUS_API_KEY.get_secret_value() or "").strip())
+    nebius_set = bool(_resolved_secrets().nebius_key)
     logger.info(
         "Config: env_file=%s, NEBIUS_API_KEY=%s",
         env_path,
         "set" if nebius_set else "not set",
     )
-    yield
+    _app.state.github_http = create_http_client()
+    # One download limit for all requests: N concurrent fetches must not open N * DOWNLOAD_CONCURRENCY
+    _app.state.github_downloads = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    _app.state.llm_http = create_llm_http_client(_resolved_secrets().nebius_key or None)
+    # Background preconnect so the first /summarize does not pay the cold TLS handshake; startup does not wait
+    preconnect = _spawn(warm_up(_app.state.llm_http, _resolved_secrets().base_url)) if nebius_set else None
+    _app.state.audit_queue = asyncio.Queue(maxsize=AUDIT_QUEUE_MAXSIZE)
+    # Admission control: caps concurrent LLM spend and the RepoFile lists held in memory
+    _app.state.summary_slots = asyncio.Semaphore(get_settings().MAX_CONCURRENT_SUMMARIES)
+    # process_repo_files is CPU-bound; worker processes run it outside this interpreter's GIL
+    _app.state.cpu_pool = _new_cpu_pool()
+    audit_task = asyncio.create_task(_audit_worker(_app.state.audit_queue))
+    try:
+        yield
+    finally:
+        # Orphaned summarize runs must not keep using the clients closed below
+        await _cancel_inflight()
+        await _app.state.audit_queue.join()
+        audit_task.cancel()
+        del _app.state.audit_queue
+        if preconnect is not None:
+            preconnect.cancel()
+        await _app.state.github_http.aclose()
+        await _app.state.llm_http.aclose()
+        if _app.state.cpu_pool is not None:
+            _app.state.cpu_pool.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(
+    title="Summary API",
+    description="Summarize public GitHub repositories",
+    lifespan=_lifespan,
+)
+logger = logging.getLogger(__name__)
 
 
-app = FastAPI(title="Summary API", description="Summarize public GitHub repositories", lifespan=_lifespan)
-logger = logging.getLogger(__name__)
+class _CorrelationIdMiddleware:
+    """ASGI middleware: give every HTTP request a correlation id and return it as X-Correlation-ID.
+
+    Why: Clients and Judge scripts need the id on every response, including validation errors.
+    What: Reuses a well-formed incoming X-Request-ID, else draws a fresh id; stores it in
+    request.state.correlation_id and the _current_correlation_id context variable (read by the JSON
+    log formatter), and appends the header on response start.
+    Plain ASGI (not BaseHTTPMiddleware), so no extra task or body re-streaming per request.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        correlation_id = _incoming_request_id(scope.get("headers", ())) or _next_correlation_id()
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
+        header = (b"x-correlation-id", correlation_id.encode("ascii"))
+
+        async def send_with_correlation_id(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        token = _current_correlation_id.set(correlation_id)
+        try:
+            await self.app(scope, receive, send_with_correlation_id)
+        finally:
+            _current_correlation_id.reset(token)
+
+
+app.add_middleware(_CorrelationIdMiddleware)
+
+# Set once structured logging is configured; a second lifespan (e.g. reused TestClient) must not re-add handlers
+_logging_configured = False
+
+# Max pending audit/DLQ writes; beyond this new entries are dropped rather than blocking requests
+AUDIT_QUEUE_MAXSIZE = 10_000
+# Max queued audit/DLQ writes handed to one worker-thread call
+AUDIT_BATCH_SIZE = 100
+
+# Correlation ids drawn per os.urandom call (see _next_correlation_id)
+CORRELATION_ID_BATCH = 256
+_correlation_ids: deque[str] = deque()
+# Upstream X-Request-ID values reused as the correlation id; anything else (spaces, quotes, >128 chars) is replaced
+_REQUEST_ID_RE = re.compile(rb"[A-Za-z0-9._:-]{1,128}")
+# Correlation id of the request being handled; tasks spawned by the request inherit it
+_current_correlation_id: ContextVar[str | None] = ContextVar("correlation_id", default=None)
+
+
+class _Flight:
+    """One in-flight _single_flight run: its task and the number of callers still awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+# Single-flight: key -> the in-flight uncached summarize run (see _single_flight)
+_inflight: dict[str, _Flight] = {}
+
+# Strong references to fire-and-forget tasks so they are not garbage-collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+# Validation errors: loc keys that mean "github_url missing/invalid", and the canned bodies pre-serialized
+GITHUB_URL_REQUIRED_MESSAGE = "github_url is required and must be a non-empty string"
+INVALID_REQUEST_MESSAGE = "Invalid request: github_url is required and must be a non-empty string"
+_GITHUB_URL_LOC = frozenset(("body", "github_url"))
+_GITHUB_URL_REQUIRED_BODY = orjson.dumps({"status": "error", "message": GITHUB_URL_REQUIRED_MESSAGE})
+_INVALID_REQUEST_BODY = orjson.dumps({"status": "error", "message": INVALID_REQUEST_MESSAGE})
+
+# Success bodies are streamed in chunks of this size so the first bytes go out before the whole copy
+RESPONSE_CHUNK_SIZE = 16 * 1024
+
+# Fixed user-facing error messages
+EMPTY_REPO_MESSAGE = "Repository is empty or has no readable files"
+UNAVAILABLE_MESSAGE = "Service temporarily unavailable. Try again later."
+
+# Fixed audit payloads, shared read-only (log_audit_step / write_to_dlq copy what they get)
+_EMPTY_FETCH_OUTPUT = MappingProxyType({"file_count": 0})
+_EMPTY_REPO_DETAIL = MappingProxyType({
+    "message": EMPTY_REPO_MESSAGE,
+    "where": "summary_api.main._run_fetch_step",
+    "error_classification": "permanent",
+})
+_GITHUB_CIRCUIT_OPEN_DETAIL = MappingProxyType({
+    "message": "Service temporarily unavailable (circuit open)",
+    "where": "summary_api.github_client.fetch_repo_files",
+    "error_classification": "transient",
+})
+_LLM_CIRCUIT_OPEN_DETAIL = MappingProxyType({
+    "message": "Service temporarily unavailable (circuit open)",
+    "where": "summary_api.llm_client.summarize_repo",
+    "error_classification": "transient",
+})
+
+# ErrorResponse documents the error shape in OpenAPI; handlers build the dict directly
+_ERROR_RESPONSES: dict[int | str, dict[str, Any]] = {
+    code: {"model": ErrorResponse} for code in (400, 401, 404, 429, 500, 502, 503)
+}
+
+# Summaries keyed by "owner/repo@sha:model" (skips fetch, process, LLM) and by hash of
+# fetched (path, content) + model (skips process and LLM when the SHA could not be resolved)
+_response_cache = TTLCache()
+
+# Resolved default-branch revision per github_url; short TTL so new pushes are picked up quickly
+REVISION_TTL_SECONDS = 60.0
+_revision_cache = TTLCache(maxsize=1024, ttl=REVISION_TTL_SECONDS)
 
 
 def _configure_structured_logging() -> None:
-    """Configure JSON structured logging when LOG_FORMAT=json for observability."""
-    if not hasattr(_configure_structured_logging, "_done"):
-        _configure_structured_logging._done = False
-    if _configure_structured_logging._done:
+    """Configure JSON structured logging when LOG_FORMAT=json for observability. Called once from _lifespan."""
+    global _logging_configured
+    if _logging_configured:
         return
-    import os
     if os.environ.get("LOG_FORMAT") == "json":
-        for h in logging.root.handlers[:]:
-            logging.root.removeHandler(h)
-        handler = logging.StreamHandler()
-        handler.setFormatter(_JsonFormatter())
-        logging.root.addHandler(handler)
+        logging.root.handlers.clear()
+        logging.root.addHandler(_JsonStreamHandler())
         logging.root.setLevel(logging.INFO)
-    _configure_structured_logging._done = True
+    _logging_configured = True
+
+
+# Optional `extra=` fields copied into JSON log lines when present on the record
+_LOG_EXTRA_FIELDS = ("correlation_id", "operation_name")
 
 
 class _JsonFormatter(logging.Formatter):
     """Format log records as JSON with timestamp, level, message, and extra fields."""
 
-    def format(self, record: logging.LogRecord) -> str:
+    def __init__(self) -> None:
+        super().__init__()
+        # (epoch second, "YYYY-MM-DDTHH:MM:SS"): records in the same second reuse the formatted prefix
+        self._second_prefix: tuple[int, str] = (-1, "")
+
+    def _timestamp(self, created: float) -> str:
+        """Return ISO-8601 UTC with milliseconds; strftime runs at most once per second."""
+        sec = int(created)
+        cached_sec, prefix = self._second_prefix
+        if sec != cached_sec:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+            self._second_prefix = (sec, prefix)
+        return f"{prefix}.{int((created - sec) * 1000):03d}Z"
+
+    def encode(self, record: logging.LogRecord, option: int = 0) -> bytes:
+        """Serialize record straight to UTF-8 JSON bytes (orjson options passed through)."""
         obj = {
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(record.created)),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "message": record.getMessage(),
             "logger": record.name,
         }
-        if hasattr(record, "correlation_id"):
-            obj["correlation_id"] = record.correlation_id
-        if hasattr(record, "operation_name"):
-            obj["operation_name"] = record.operation_name
-        return json.dumps(obj, ensure_ascii=False)
+        record_dict = record.__dict__
+        for field in _LOG_EXTRA_FIELDS:
+            if field in record_dict:
+                obj[field] = record_dict[field]
+        if "correlation_id" not in obj:
+            correlation_id = _current_correlation_id.get()
+            if correlation_id is not None:
+                obj["correlation_id"] = correlation_id
+        return orjson.dumps(obj, option=option)
+
+    def format(self, record: logging.LogRecord) -> str:
+        return self.encode(record).decode("utf-8")
+
+
+class _JsonStreamHandler(logging.StreamHandler):
+    """Write JSON log lines as bytes to the stream's binary buffer, skipping the str round-trip."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setFormatter(_JsonFormatter())
+
+    def emit(self, record: logging.LogRecord) -> None:
+        buffer = getattr(self.stream, "buffer", None)
+        if buffer is None:
+            # Text-only stream (e.g. captured in tests): fall back to the str path
+            super().emit(record)
+            return
+        try:
+            buffer.write(self.formatter.encode(record, orjson.OPT_APPEND_NEWLINE))
+            buffer.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
 
 @app.exception_handler(RequestValidationError)
-def validation_exception_handler(_request: object, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(_request: object, exc: RequestValidationError) -> Response:
     """Return spec error body for validation errors (missing/invalid github_url).
 
     Why: Ensures clients receive a consistent ErrorResponse shape per API spec.
-    What: Maps Pydantic validation errors to a single user-facing message.
+    What: Maps Pydantic validation errors to a single user-facing message; the two canned
+    bodies are pre-serialized so malformed-request floods skip JSON encoding.
 
     Args:
         _request: The FastAPI request (unused).
         exc: The validation exception with error details.
 
     Returns:
-        JSONResponse with status 400 and ErrorResponse body.
+        Response with status 400 and ErrorResponse body.
     """
     errors = exc.errors() or []
-    if errors:
-        first = errors[0]
-        msg = first.get("msg", "Invalid request")
-        loc = first.get("loc", ())
-        if "body" in loc and "github_url" in loc:
-            msg = "github_url is required and must be a non-empty string"
-        elif "body" in loc:
-            msg = "Invalid request: github_url is required and must be a non-empty string"
-    else:
-        msg = "Invalid request: github_url is required and must be a non-empty string"
-    return JSONResponse(
-        status_code=400,
-        content=ErrorResponse(status="error", message=msg).model_dump(),
-    )
+    if not errors:
+        return _json_bytes_response(_INVALID_REQUEST_BODY, 400)
+    first = errors[0]
+    loc = frozenset(first.get("loc", ()))
+    if _GITHUB_URL_LOC <= loc:
+        return _json_bytes_response(_GITHUB_URL_REQUIRED_BODY, 400)
+    if "body" in loc:
+        return _json_bytes_response(_INVALID_REQUEST_BODY, 400)
+    return _json_bytes_response(orjson.dumps(_error_body(first.get("msg", "Invalid request"))), 400)
+
+
+def _json_bytes_response(body: bytes, status_code: int) -> Response:
+    """Wrap already-serialized JSON bytes in a Response."""
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+# (lowercase needle, HTTP status) in priority order; first match wins, else 502.
+_GITHUB_ERROR_RULES: tuple[tuple[str, int], ...] = (
+    ("invalid github url", 400),
+    ("not found", 404),
+    ("private", 404),
+    ("timed out", 502),
+    ("network error", 502),
+    ("rate limit", 503),
+    ("403", 503),
+)
+_LLM_ERROR_RULES: tuple[tuple[str, int], ...] = (
+    ("authentication", 401),
+    ("api key", 401),
+    ("401", 401),
+    ("rate limit", 429),
+    ("429", 429),
+)
+
+
+@lru_cache(maxsize=None)
+def _rules_pattern(rules: tuple[tuple[str, int], ...]) -> re.Pattern[str]:
+    """Compile rules into one case-insensitive regex; branch i matches iff needle i occurs anywhere.
+
+    Anchored lookahead branches are tried in rule order, so the first matching rule wins (a plain
+    alternation would return the leftmost match in the message instead).
+    """
+    branches = "|".join(f"(?=.*?(?P<r{i}>{re.escape(needle)}))" for i, (needle, _) in enumerate(rules))
+    return re.compile(f"^(?:{branches})", re.I | re.S)
+
+
+@lru_cache(maxsize=256)
+def _classify_message(msg: str, rules: tuple[tuple[str, int], ...]) -> int:
+    """Return the status of the first rule whose needle occurs in msg (case-insensitive), else 502.
+
+    One precompiled regex per rule set; cached per (msg, rules): during an upstream outage the same
+    message repeats many times.
+    """
+    m = _rules_pattern(rules).match(msg)
+    return rules[int(m.lastgroup[1:])][1] if m else 502
 
 
 def _github_error_to_status_and_message(exc: GitHubClientError) -> tuple[int, str]:
@@ -133,15 +393,7 @@ def _github_error_to_status_and_message(exc: GitHubClientError) -> tuple[int, st
         (status_code, message) for the error response.
     """
     msg = exc.message or str(exc)
-    if "Invalid GitHub URL" in msg:
-        return 400, msg
-    if "not found" in msg.lower() or "private" in msg.lower():
-        return 404, msg
-    if "timed out" in msg.lower() or "Network error" in msg:
-        return 502, msg
-    if "rate limit" in msg.lower() or "403" in msg:
-        return 503, msg
-    return 502, msg
+    return _classify_message(msg, _GITHUB_ERROR_RULES), msg
 
 
 def _llm_error_to_status_and_message(exc: LLMClientError) -> tuple[int, str]:
@@ -157,35 +409,184 @@ def _llm_error_to_status_and_message(exc: LLMClientError) -> tuple[int, str]:
         (status_code, message) for the error response.
     """
     msg = exc.message or str(exc)
-    if "authentication" in msg.lower() or "API key" in msg or "401" in msg:
-        return 401, msg
-    if "rate limit" in msg.lower() or "429" in msg:
-        return 429, msg
-    if "timed out" in msg.lower() or "network" in msg.lower():
-        return 502, msg
-    if "server error" in msg.lower() or "500" in msg:
-        return 502, msg
-    return 502, msg
-
-
-def _get_llm_provider_and_key(settings: object) -> tuple[str, str]:
+    return _classify_message(msg, _LLM_ERROR_RULES), msg
+
+
+class _ResolvedSettings(NamedTuple):
+    """Per-process snapshot of the settings used on the request path (secrets unwrapped)."""
+
+    github_token: str | None
+    nebius_key: str
+    base_url: str | None
+    model: str | None
+    max_tokens: int
+
+    def __repr__(self) -> str:
+        # Never expose the unwrapped secrets (SecretStr masked them on Settings)
+        return f"_ResolvedSettings(base_url={self.base_url!r}, model={self.model!r}, max_tokens={self.max_tokens})"
+
+
+@lru_cache(maxsize=1)
+def _resolved_secrets() -> _ResolvedSettings:
+    """Unwrap secrets and read the LLM settings once per process.
+
+    Why: Settings are loaded once; unwrapping SecretStr and reading fields on every request only copies strings.
+    What: Reads GITHUB_TOKEN, NEBIUS_API_KEY (stripped) and the Nebius base URL/model/max tokens from get_settings().
+
+    Returns:
+        _ResolvedSettings; github_token is None and nebius_key empty when not set.
+    """
+    settings = get_settings()
+    return _ResolvedSettings(
+        github_token=(settings.GITHUB_TOKEN.get_secret_value() or "").strip() or None,
+        nebius_key=(settings.NEBIUS_API_KEY.get_secret_value() or "").strip(),
+        base_url=settings.NEBIUS_BASE_URL,
+        model=settings.NEBIUS_MODEL,
+        max_tokens=settings.NEBIUS_MAX_TOKENS,
+    )
+
+
+def _get_llm_provider_and_key() -> tuple[str, str]:
     """Return Nebius as provider and NEBIUS_API_KEY (or empty string if not set).
 
     Why: Centralizes secret access so callers never log the key.
-    What: Reads SecretStr from settings; returns provider name and raw key for the client.
+    What: Returns provider name and the raw key resolved once by _resolved_secrets().
+
+    Returns:
+        (provider_name, api_key_string).
+    """
+    return "nebius", _resolved_secrets().nebius_key
+
+
+def _incoming_request_id(headers: Any) -> str | None:
+    """Return the request's X-Request-ID if it is a safe token to echo and log, else None."""
+    for name, value in headers:
+        if name == b"x-request-id":
+            return value.decode("ascii") if _REQUEST_ID_RE.fullmatch(value) else None
+    return None
+
+
+def _next_correlation_id() -> str:
+    """Return a random 128-bit correlation id (32 hex chars) from a pool refilled in batches.
+
+    One os.urandom call per CORRELATION_ID_BATCH ids; deque popleft/extend are atomic, so no lock is needed.
+    """
+    try:
+        return _correlation_ids.popleft()
+    except IndexError:
+        buf = os.urandom(16 * CORRELATION_ID_BATCH).hex()
+        _correlation_ids.extend(buf[i:i + 32] for i in range(32, len(buf), 32))
+        return buf[:32]
+
+
+def _spawn(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """Start coro as a background task and keep a reference until it finishes."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+def _write_audit_batch(batch: list[tuple[Callable[..., None], tuple, dict]]) -> None:
+    """Run queued audit/DLQ writes in order; one failing entry does not stop the rest."""
+    for fn, args, kwargs in batch:
+        try:
+            fn(*args, **kwargs)
+        except Exception:
+            pass
+
+
+async def _single_flight(key: str, work: Callable[[], Coroutine[Any, Any, Any]]) -> tuple[Any, bool]:
+    """Run work() once per key among concurrent callers.
+
+    The first caller (leader) starts it as a background task; callers arriving while it is in
+    flight await the same outcome (or exception). Every caller awaits through asyncio.shield, so a
+    cancelled caller (leader included) stops waiting without cancelling the run for the others;
+    the run is cancelled once its last caller is gone, so it never outlives every request.
+    Returns (outcome, shared), shared being True for those followers.
+    """
+    flight = _inflight.get(key)
+    shared = flight is not None
+    if flight is None:
+        flight = _Flight(_spawn(work()))
+        _inflight[key] = flight
+        flight.task.add_done_callback(partial(_end_flight, key, flight))
+    flight.waiters += 1
+    try:
+        return await asyncio.shield(flight.task), shared
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            # Every caller is gone: stop the fetch/LLM work instead of letting it run outside
+            # summary_slots. Unregister now so a new caller starts a fresh run, not this cancelled one.
+            if _inflight.get(key) is flight:
+                del _inflight[key]
+            flight.task.cancel()
+
+
+def _end_flight(key: str, flight: _Flight, task: asyncio.Task) -> None:
+    """Done callback for a _single_flight run: free its key and mark its exception as retrieved."""
+    if _inflight.get(key) is flight:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # no "never retrieved" warning when every caller was cancelled
+
+
+async def _cancel_inflight() -> None:
+    """Cancel the running _single_flight runs and wait for them (lifespan shutdown, before clients close)."""
+    tasks = [flight.task for flight in _inflight.values()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _audit_worker(queue: asyncio.Queue) -> None:
+    """Drain queued audit/DLQ writes off the request path in batches; write errors are swallowed.
+
+    Waits for one entry, takes whatever else is already queued (up to AUDIT_BATCH_SIZE), and writes
+    the batch in a worker thread so file I/O never blocks the event loop.
+    """
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < AUDIT_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+        try:
+            await asyncio.to_thread(_write_audit_batch, batch)
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+def _submit_audit(fn: Callable[..., None], *args: Any, **kwargs: Any) -> None:
+    """Queue one audit/DLQ write (log_audit, log_audit_step, write_to_dlq) for the background worker.
+
+    Why: Audit and DLQ file writes must not add latency to the response.
+    What: put_nowait on app.state.audit_queue; if the queue is full, the oldest queued entry is dropped
+    (with a warning) to make room, so a backlog keeps the most recent history.
+    Runs the write inline (errors swallowed) when the lifespan has not started the worker.
 
     Args:
-        settings: Application Settings instance from get_settings().
+        fn: Audit or DLQ writer to call.
+        args: Positional arguments for fn.
+        kwargs: Keyword arguments for fn.
 
     Returns:
-        (provider_name, api_key_string).
+        None.
     """
-    raw = getattr(settings, "NEBIUS_API_KEY", None)
-    if hasattr(raw, "get_secret_value"):
-        nebius_key = (raw.get_secret_value() or "").strip()
-    else:
-        nebius_key = (raw or "").strip() if isinstance(raw, str) else ""
-    return "nebius", nebius_key
+    queue = getattr(app.state, "audit_queue", None)
+    if queue is None:
+        try:
+            fn(*args, **kwargs)
+        except Exception:
+            pass
+        return
+    try:
+        queue.put_nowait((fn, args, kwargs))
+    except asyncio.QueueFull:
+        dropped_fn, _, _ = queue.get_nowait()
+        queue.task_done()
+        queue.put_nowait((fn, args, kwargs))
+        logger.warning("Audit queue full; dropped oldest %s entry", dropped_fn.__name__)
 
 
 def _audit(
@@ -194,11 +595,12 @@ def _audit(
     result: str,
     status_code: int,
     message: str | None = None,
+    cache: str | None = None,
 ) -> None:
     """Write one audit entry; swallow errors so response is never broken.
 
     Why: Audit trail must not affect API response.
-    What: Calls log_audit with api_request event; ignores any write error.
+    What: Queues log_audit with api_request event for the background writer; ignores any error.
 
     Args:
         request_github_url: The requested repo URL (sanitized).
@@ -206,6 +608,7 @@ def _audit(
         result: "success" or "failure".
         status_code: HTTP status returned to client.
         message: Optional error message for failures.
+        cache: Optional response-cache outcome ("HIT" or "MISS") for successes.
 
     Returns:
         None.
@@ -214,7 +617,10 @@ def _audit(
         meta = {"github_url": request_github_url, "status_code": status_code}
         if message:
             meta["message"] = message
-        log_audit(
+        if cache:
+            meta["cache"] = cache
+        _submit_audit(
+            log_audit,
             event_type="api_request",
             resource="/summarize",
             action="POST",
@@ -226,27 +632,14 @@ def _audit(
         pass
 
 
-def _with_correlation_header(
-    content: dict, status: int, correlation_id: str
-) -> JSONResponse:
-    """Build JSONResponse with X-Correlation-ID for LLM-as-Judge trace lookup.
-
-    Why: Clients and Judge scripts need the correlation ID in the response.
-    What: Wraps JSONResponse with X-Correlation-ID header.
+def _error_body(message: str) -> dict[str, str]:
+    """Return the ErrorResponse body as a plain dict (same shape, no model validation)."""
+    return {"status": "error", "message": message}
 
-    Args:
-        content: Response body dict.
-        status: HTTP status code.
-        correlation_id: Request UUID.
 
-    Returns:
-        JSONResponse with header set.
-    """
-    return JSONResponse(
-        status_code=status,
-        content=content,
-        headers={"X-Correlation-ID": correlation_id},
-    )
+def _error_response(message: str, status: int) -> Response:
+    """Build the ErrorResponse JSON reply; X-Correlation-ID is added by _CorrelationIdMiddleware."""
+    return _json_bytes_response(orjson.dumps(_error_body(message)), status)
 
 
 def _error_detail_with_classification(exc: BaseException, where: str) -> dict:
@@ -262,7 +655,8 @@ async def _run_fetch_step(
     correlation_id: str,
     github_url: str,
     github_token: str | None,
-) -> tuple[list[RepoFile] | None, JSONResponse | None]:
+    http_client: httpx.AsyncClient | None = None,
+) -> tuple[list[RepoFile] | None, Response | None]:
     """Run fetch_repo_files step; return (files, None) on success or (None, error_response) on failure.
 
     Why: Keeps summarize() under 20 lines by extracting step logic.
@@ -272,140 +666,188 @@ async def _run_fetch_step(
         correlation_id: Request UUID.
         github_url: Repo URL from request.
         github_token: Optional GitHub token from settings.
+        http_client: Shared httpx.AsyncClient from the app lifespan; None creates one per call.
 
     Returns:
-        (files, None) on success; (None, JSONResponse) on failure (caller should return the response).
+        (files, None) on success; (None, error Response) on failure (caller should return the response).
     """
-    t0 = time.perf_counter()
+    t0 = time.perf_counter_ns()
     req_summary = {"github_url": github_url, "has_token": bool(github_token)}
     try:
-        files = await fetch_repo_files(github_url, github_token=github_token)
-        duration_ms = (time.perf_counter() - t0) * 1000
+        files = await fetch_repo_files(
+            github_url,
+            github_token=github_token,
+            client=http_client,
+            download_limit=getattr(app.state, "github_downloads", None),
+        )
+        duration_ms = (time.perf_counter_ns() - t0) / 1_000_000
         if not files:
-            log_audit_step(
-                correlation_id, "fetch_repo_files", "failure",
+            _submit_audit(
+                log_audit_step, correlation_id, "fetch_repo_files", "failure",
                 step_index=1, input_summary=req_summary,
-                output_summary={"file_count": 0},
-                error_detail={"message": "Repository is empty or has no readable files", "where": "summary_api.main._run_fetch_step", "error_classification": "permanent"},
+                output_summary=_EMPTY_FETCH_OUTPUT,
+                error_detail=_EMPTY_REPO_DETAIL,
                 duration_ms=duration_ms,
             )
-            return None, _with_correlation_header(
-                ErrorResponse(status="error", message="Repository is empty or has no readable files").model_dump(),
-                404, correlation_id,
-            )
-        log_audit_step(
-            correlation_id, "fetch_repo_files", "success",
+            return None, _error_response(EMPTY_REPO_MESSAGE, 404)
+        _submit_audit(
+            log_audit_step, correlation_id, "fetch_repo_files", "success",
             step_index=1, input_summary=req_summary,
             output_summary={"file_count": len(files)}, duration_ms=duration_ms,
         )
         return files, None
     except GitHubClientError as e:
-        duration_ms = (time.perf_counter() - t0) * 1000
-        log_audit_step(
-            correlation_id, "fetch_repo_files", "failure",
+        duration_ms = (time.perf_counter_ns() - t0) / 1_000_000
+        err_detail = _error_detail_with_classification(e, "summary_api.github_client.fetch_repo_files")
+        _submit_audit(
+            log_audit_step, correlation_id, "fetch_repo_files", "failure",
             step_index=1, input_summary=req_summary,
-            error_detail=_error_detail_with_classification(e, "summary_api.github_client.fetch_repo_files"),
+            error_detail=err_detail,
             duration_ms=duration_ms,
         )
-        write_to_dlq(
-            correlation_id, "fetch_repo_files",
+        _submit_audit(
+            write_to_dlq, correlation_id, "fetch_repo_files",
             request_summary=req_summary,
-            error_detail=_error_detail_with_classification(e, "summary_api.github_client.fetch_repo_files"),
+            error_detail=err_detail,
         )
         status, message = _github_error_to_status_and_message(e)
-        return None, _with_correlation_header(
-            ErrorResponse(status="error", message=message).model_dump(), status, correlation_id
-        )
+        return None, _error_response(message, status)
     except CircuitBreakerError as e:
-        duration_ms = (time.perf_counter() - t0) * 1000
-        log_audit_step(
-            correlation_id, "fetch_repo_files", "failure",
+        duration_ms = (time.perf_counter_ns() - t0) / 1_000_000
+        _submit_audit(
+            log_audit_step, correlation_id, "fetch_repo_files", "failure",
             step_index=1, input_summary=req_summary,
-            error_detail={"message": "Service temporarily unavailable (circuit open)", "where": "summary_api.github_client.fetch_repo_files", "error_classification": "transient"},
+            error_detail=_GITHUB_CIRCUIT_OPEN_DETAIL,
             duration_ms=duration_ms,
         )
-        write_to_dlq(
-            correlation_id, "fetch_repo_files",
+        _submit_audit(
+            write_to_dlq, correlation_id, "fetch_repo_files",
             request_summary=req_summary,
             error_detail={"message": str(e), "error_classification": "transient"},
         )
-        return None, _with_correlation_header(
-            ErrorResponse(status="error", message="Service temporarily unavailable. Try again later.").model_dump(),
-            503, correlation_id,
-        )
+        return None, _error_response(UNAVAILABLE_MESSAGE, 503)
+
+
+async def _run_cpu_bound(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run fn(*args) in the lifespan's process pool, or the default thread pool without one.
+
+    A pool broken by a dead worker is replaced. A pool whose workers cannot be started at all (e.g. spawn
+    from a script without an `if __name__ == "__main__"` guard raises RuntimeError) is dropped, and later
+    calls use threads. Either way this call falls back to a thread instead of failing the request.
+    """
+    pool = getattr(app.state, "cpu_pool", None)
+    loop = asyncio.get_running_loop()
+    if pool is None:
+        return await loop.run_in_executor(None, fn, *args)
+    try:
+        try:
+            # submit() starts the worker processes, so pool startup errors are raised here, not by fn
+            future = loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            raise  # a RuntimeError too, but handled below: the pool is replaced, not dropped
+        except Exception:
+            logger.warning("CPU process pool cannot start workers; using threads", exc_info=True)
+            _retire_cpu_pool(pool, recreate=False)
+            return await loop.run_in_executor(None, fn, *args)
+        return await future
+    except BrokenProcessPool:
+        logger.warning("CPU process pool broken; recreating it")
+        _retire_cpu_pool(pool, recreate=True)
+        return await loop.run_in_executor(None, fn, *args)
+
+
+def _retire_cpu_pool(pool: ProcessPoolExecutor, *, recreate: bool) -> None:
+    """Shut down a failed pool and install a new one (recreate) or none (threads from now on).
+
+    Only while pool is still app.state.cpu_pool: when several requests see the same failure at once,
+    the first one swaps it and the rest leave the replacement alone instead of leaking their own.
+    """
+    if getattr(app.state, "cpu_pool", None) is not pool:
+        return
+    app.state.cpu_pool = _new_cpu_pool() if recreate else None
+    pool.shutdown(wait=False, cancel_futures=True)
 
 
-def _run_process_step(
+def _new_cpu_pool() -> ProcessPoolExecutor:
+    """Create the process pool for CPU-bound steps; spawn, not fork: the server process already has threads."""
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+
+async def _run_process_step(
     correlation_id: str,
     files: list[RepoFile],
-) -> tuple[str | None, JSONResponse | None]:
+) -> tuple[str | None, Response | None]:
     """Run process_repo_files step; return (context, None) on success or (None, error_response) on failure.
 
-    Why: Keeps summarize() under 20 lines; process is sync and fast.
-    What: Calls process_repo_files, measures duration, logs audit step.
+    Why: Keeps summarize() under 20 lines; process is CPU-bound and must not stall other requests.
+    What: Trims the files to what process_repo_files can use (see trim_repo_files), runs it in the lifespan's
+    process pool (default thread pool without lifespan), measures duration, logs audit step from the event loop.
 
     Args:
         correlation_id: Request UUID.
         files: List of repo files from fetch step.
 
     Returns:
-        (context, None) on success; (None, JSONResponse) on failure.
+        (context, None) on success; (None, error Response) on failure.
     """
-    t0 = time.perf_counter()
+    input_summary = {"file_count": len(files)}
+    t0 = time.perf_counter_ns()
     try:
-        context = process_repo_files(files)
-        duration_ms = (time.perf_counter() - t0) * 1000
-        log_audit_step(
-            correlation_id, "process_repo_files", "success",
-            step_index=2, input_summary={"file_count": len(files)},
+        # Only what process_repo_files can use is pickled into the worker, not every full body
+        context = await _run_cpu_bound(process_repo_files, trim_repo_files(files))
+        duration_ms = (time.perf_counter_ns() - t0) / 1_000_000
+        _submit_audit(
+            log_audit_step, correlation_id, "process_repo_files", "success",
+            step_index=2, input_summary=input_summary,
             output_summary={"context_length": len(context)}, duration_ms=duration_ms,
         )
         return context, None
     except Exception as e:
-        duration_ms = (time.perf_counter() - t0) * 1000
-        log_audit_step(
-            correlation_id, "process_repo_files", "failure",
-            step_index=2, input_summary={"file_count": len(files)},
+        duration_ms = (time.perf_counter_ns() - t0) / 1_000_000
+        _submit_audit(
+            log_audit_step, correlation_id, "process_repo_files", "failure",
+            step_index=2, input_summary=input_summary,
             error_detail={**error_detail_from_exception(e, "summary_api.repo_processor.process_repo_files"), "error_classification": "permanent"},
             duration_ms=duration_ms,
         )
-        return None, _with_correlation_header(
-            ErrorResponse(status="error", message=str(e)).model_dump(), 500, correlation_id
-        )
+        return None, _error_response(str(e), 500)
 
 
 async def _run_llm_step(
     correlation_id: str,
     context: str,
-    settings: object,
-) -> tuple[dict | None, JSONResponse | None]:
+    http_client: httpx.AsyncClient | None = None,
+) -> tuple[dict | None, Response | None]:
     """Run summarize_repo (LLM) step; return (result, None) on success or (None, error_response) on failure.
 
     Why: Keeps summarize() under 20 lines by extracting LLM call and audit.
-    What: Gets provider/key from settings, awaits async summarize_repo, logs audit step; on exception writes DLQ and returns error.
+    What: Gets provider/key and LLM settings from _resolved_secrets(), awaits async summarize_repo, logs audit step;
+    on exception writes DLQ and returns error.
 
     Args:
         correlation_id: Request UUID.
         context: Prepared context from process step.
-        settings: Application Settings.
+        http_client: Shared httpx.AsyncClient for the LLM API; None creates one per call.
 
     Returns:
-        (result_dict, None) on success; (None, JSONResponse) on failure.
+        (result_dict, None) on success; (None, error Response) on failure.
     """
-    provider, api_key = _get_llm_provider_and_key(settings)
-    t0 = time.perf_counter()
+    provider, api_key = _get_llm_provider_and_key()
+    resolved = _resolved_secrets()
+    t0 = time.perf_counter_ns()
     input_summary = {"context_length": len(context), "provider": provider}
     try:
         result = await summarize_repo(
             context,
             api_key=api_key,
-            base_url=getattr(settings, "NEBIUS_BASE_URL", None),
-            model=getattr(settings, "NEBIUS_MODEL", None),
-            max_tokens=getattr(settings, "NEBIUS_MAX_TOKENS", 4096),
+            base_url=resolved.base_url,
+            model=resolved.model,
+            max_tokens=resolved.max_tokens,
+            client=http_client,
         )
-        duration_ms = (time.perf_counter() - t0) * 1000
-        log_audit_step(
-            correlation_id, "summarize_repo", "success",
+        duration_ms = (time.perf_counter_ns() - t0) / 1_000_000
+        _submit_audit(
+            log_audit_step, correlation_id, "summarize_repo", "success",
             step_index=3, input_summary=input_summary,
             output_summary={
                 "summary_length": len(result.get("summary", "") or ""),
@@ -416,44 +858,110 @@ async def _run_llm_step(
         )
         return result, None
     except LLMClientError as e:
-        duration_ms = (time.perf_counter() - t0) * 1000
+        duration_ms = (time.perf_counter_ns() - t0) / 1_000_000
         err_detail = _error_detail_with_classification(e, "summary_api.llm_client.summarize_repo")
-        log_audit_step(
-            correlation_id, "summarize_repo", "failure",
+        _submit_audit(
+            log_audit_step, correlation_id, "summarize_repo", "failure",
             step_index=3, input_summary=input_summary,
             error_detail=err_detail,
             duration_ms=duration_ms,
         )
-        write_to_dlq(
-            correlation_id, "summarize_repo",
-            request_summary={"context_length": len(context), "provider": provider},
+        _submit_audit(
+            write_to_dlq, correlation_id, "summarize_repo",
+            request_summary=input_summary,
             error_detail=err_detail,
         )
         status, message = _llm_error_to_status_and_message(e)
-        return None, _with_correlation_header(
-            ErrorResponse(status="error", message=message).model_dump(), status, correlation_id
-        )
+        return None, _error_response(message, status)
     except CircuitBreakerError as e:
-        duration_ms = (time.perf_counter() - t0) * 1000
-        log_audit_step(
-            correlation_id, "summarize_repo", "failure",
+        duration_ms = (time.perf_counter_ns() - t0) / 1_000_000
+        _submit_audit(
+            log_audit_step, correlation_id, "summarize_repo", "failure",
             step_index=3, input_summary=input_summary,
-            error_detail={"message": "Service temporarily unavailable (circuit open)", "where": "summary_api.llm_client.summarize_repo", "error_classification": "transient"},
+            error_detail=_LLM_CIRCUIT_OPEN_DETAIL,
             duration_ms=duration_ms,
         )
-        write_to_dlq(
-            correlation_id, "summarize_repo",
+        _submit_audit(
+            write_to_dlq, correlation_id, "summarize_repo",
             request_summary=input_summary,
             error_detail={"message": str(e), "error_classification": "transient"},
         )
-        return None, _with_correlation_header(
-            ErrorResponse(status="error", message="Service temporarily unavailable. Try again later.").model_dump(),
-            503, correlation_id,
-        )
+        return None, _error_response(UNAVAILABLE_MESSAGE, 503)
+
+
+async def _resolve_revision(
+    github_url: str,
+    github_token: str | None,
+    http_client: httpx.AsyncClient | None,
+) -> str | None:
+    """Return "owner/repo@sha" for the default-branch HEAD, or None; remembered per URL for REVISION_TTL_SECONDS.
+
+    Why: A commit-keyed cache hit skips the whole fetch (hundreds of GitHub requests), not just the LLM call.
+    What: One cheap GitHub request (fetch_repo_revision); failures return None and the normal flow reports them.
+    """
+    revision = _revision_cache.get(github_url)
+    if revision is None:
+        revision = await fetch_repo_revision(github_url, github_token=github_token, client=http_client)
+        if revision is not None:
+            _revision_cache.put(github_url, revision)
+    return revision
+
+
+def _cache_hit(github_url: str, correlation_id: str, cached: dict) -> StreamingResponse:
+    """Audit a revision-key response-cache hit and return the cached summary."""
+    _submit_audit(
+        log_audit_step, correlation_id, "response_cache", "success",
+        step_index=1, output_summary={"cache": "hit", "key": "revision"},
+    )
+    _audit(github_url, correlation_id, "success", 200, cache="HIT")
+    return _success_response(cached, cache_status="HIT")
+
+
+def _success_response(result: dict, cache_status: str) -> StreamingResponse:
+    """Build the 200 response body per spec from an LLM result dict.
+
+    Why: Shared by the cache-hit and fresh-summary paths of summarize().
+    What: Logs field lengths and serializes summary, technologies, structure as JSON.
+
+    Args:
+        result: Dict with summary, technologies, structure (from summarize_repo or cache).
+        cache_status: "HIT", "MISS" or "COALESCED" (shared an in-flight identical request), returned in X-Cache.
+
+    Returns:
+        StreamingResponse sending the JSON body in RESPONSE_CHUNK_SIZE chunks, with Content-Length
+        and X-Cache headers (X-Correlation-ID is added by _CorrelationIdMiddleware).
+    """
+    summary_str = result.get("summary", "") or ""
+    structure_str = result.get("structure", "") or ""
+    logger.info(
+        "Response lengths: summary=%d chars, structure=%d chars",
+        len(summary_str),
+        len(structure_str),
+        extra={"operation_name": "summarize"},
+    )
+    # Server-produced result (technologies already filtered to str): same shape as SummarizeResponse, no validation
+    body = {
+        "summary": summary_str,
+        "technologies": result.get("technologies") or [],
+        "structure": structure_str,
+    }
+    body_bytes = orjson.dumps(body, option=orjson.OPT_INDENT_2)
+    return StreamingResponse(
+        _iter_chunks(body_bytes),
+        media_type="application/json",
+        status_code=200,
+        headers={"X-Cache": cache_status, "Content-Length": str(len(body_bytes))},
+    )
+
+
+async def _iter_chunks(data: bytes, size: int = RESPONSE_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield data in size-byte slices."""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
 
 
 @app.get("/")
-def root() -> dict[str, str]:
+async def root() -> dict[str, str]:
     """Root route: point to the summarize endpoint and API docs."""
     return {
         "message": "Summary API. Use POST /summarize with {\"github_url\": \"https://github.com/owner/repo\"}",
@@ -461,56 +969,124 @@ def root() -> dict[str, str]:
     }
 
 
-@app.post("/summarize", response_model=SummarizeResponse)
+@app.post("/summarize", response_model=SummarizeResponse, responses=_ERROR_RESPONSES)
 async def summarize(
-    request: SummarizeRequest, response: Response
-) -> SummarizeResponse | JSONResponse:
+    request: SummarizeRequest, http_request: Request
+) -> Response:
     """Full flow: fetch repo → process context → LLM summarize → return JSON per spec.
 
     Why: Single entrypoint for the summarize API; delegates to step helpers for clarity and rule compliance (max 20 lines).
     What: Runs fetch, process, LLM steps in order; on any failure returns error response; on success audits and returns SummarizeResponse.
+    A repeat request for an unchanged HEAD commit is served from the response cache without fetching; if the
+    commit cannot be resolved, unchanged fetched contents still skip the process and LLM steps.
+    At most MAX_CONCURRENT_SUMMARIES requests run the flow at once; the rest wait for a slot.
     """
-    correlation_id = str(uuid.uuid4())
-    settings = get_settings()
-    github_token = settings.GITHUB_TOKEN.get_secret_value() or None
-
-    files, err = await _run_fetch_step(correlation_id, request.github_url, github_token)
+    correlation_id = http_request.state.correlation_id
+    async with getattr(app.state, "summary_slots", None) or nullcontext():
+        return await _summarize_flow(request, correlation_id)
+
+
+async def _summarize_flow(request: SummarizeRequest, correlation_id: str) -> Response:
+    """Run the fetch → cache → process → LLM steps for one request (see summarize)."""
+    resolved = _resolved_secrets()
+    github_token = resolved.github_token
+
+    llm_http = getattr(app.state, "llm_http", None)
+    github_http = getattr(app.state, "github_http", None)
+    model = resolved.model or ""
+    # Fast path without any GitHub call: HEAD was resolved recently and its summary is cached
+    known_revision = _revision_cache.get(request.github_url)
+    if known_revision is not None:
+        cached = _response_cache.get(f"{known_revision}:{model}")
+        if cached is not None:
+            return _cache_hit(request.github_url, correlation_id, cached)
+
+    # Concurrent requests for the same repo share one revision lookup + fetch + LLM run
+    (result, cache_status, err), shared = await _single_flight(
+        f"{request.github_url}:{model}",
+        lambda: _summarize_uncached(
+            request.github_url, correlation_id, github_token, github_http, llm_http, resolved.base_url, model
+        ),
+    )
     if err is not None:
+        if shared:
+            err = _json_bytes_response(err.body, err.status_code)
         _audit(request.github_url, correlation_id, "failure", err.status_code, None)
         return err
+    if shared:
+        cache_status = "COALESCED"
+    _audit(request.github_url, correlation_id, "success", 200, cache=cache_status)
+    return _success_response(result, cache_status=cache_status)
 
-    context, err = _run_process_step(correlation_id, files)
-    if err is not None:
-        _audit(request.github_url, correlation_id, "failure", err.status_code, None)
-        return err
 
-    result, err = await _run_llm_step(correlation_id, context, settings)
+async def _summarize_uncached(
+    github_url: str,
+    correlation_id: str,
+    github_token: str | None,
+    github_http: httpx.AsyncClient | None,
+    llm_http: httpx.AsyncClient | None,
+    base_url: str | None,
+    model: str,
+) -> tuple[dict | None, str, Response | None]:
+    """Revision lookup → revision cache → fetch → content cache → process → LLM for one repo.
+
+    Why: Runs once per single-flight key; concurrent identical requests await its outcome, so they
+    also share the HEAD lookup.
+    What: Step audits use the leader's correlation_id; the final api_request audit is left to each caller.
+    When a Nebius key is set, the LLM connection is warmed while GitHub is fetched, only once the revision
+    cache has missed. The LLM call does not wait for it (a pending handshake on the shared pool is reused
+    anyway); the warm-up is cancelled if the flow ends before the LLM step (fetch error, content cache hit).
+
+    Returns:
+        (result, "HIT" or "MISS", None) on success; (None, "", error_response) on failure.
+    """
+    revision = await _resolve_revision(github_url, github_token, github_http)
+    revision_key = f"{revision}:{model}" if revision else None
+    if revision_key is not None:
+        cached = _response_cache.get(revision_key)
+        if cached is not None:
+            _submit_audit(
+                log_audit_step, correlation_id, "response_cache", "success",
+                step_index=1, output_summary={"cache": "hit", "key": "revision"},
+            )
+            return cached, "HIT", None
+
+    # Warm the LLM connection while GitHub is being fetched; without a key the LLM step fails anyway
+    warm_task = None
+    if llm_http is not None and _resolved_secrets().nebius_key:
+        warm_task = _spawn(warm_up(llm_http, base_url))
+    reached_llm = False
+    try:
+        files, err = await _run_fetch_step(correlation_id, github_url, github_token, github_http)
+        if err is not None:
+            return None, "", err
+
+        # Hashing every file body is CPU work: keep it off the event loop. A thread, not the process
+        # pool, since hashlib releases the GIL and pickling the bodies would cost as much as hashing
+        cache_key = await asyncio.to_thread(content_key, [(f.path, f.content) for f in files], model)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            if revision_key is not None:
+                _response_cache.put(revision_key, cached)
+            _submit_audit(
+                log_audit_step, correlation_id, "response_cache", "success",
+                step_index=2, output_summary={"cache": "hit", "key": "content"},
+            )
+            return cached, "HIT", None
+
+        context, err = await _run_process_step(correlation_id, files)
+        if err is not None:
+            return None, "", err
+        reached_llm = True
+    finally:
+        if warm_task is not None and not reached_llm:
+            warm_task.cancel()
+    # Not awaited: a slow warm-up must not delay the LLM call, which races it on the shared pool
+    result, err = await _run_llm_step(correlation_id, context, llm_http)
     if err is not None:
-        _audit(request.github_url, correlation_id, "failure", err.status_code, None)
-        return err
+        return None, "", err
 
-    _audit(request.github_url, correlation_id, "success", 200)
-    summary_str = result.get("summary", "") or ""
-    structure_str = result.get("structure", "") or ""
-    logger.info(
-        "Response lengths: summary=%d chars, structure=%d chars",
-        len(summary_str),
-        len(structure_str),
-        extra={"correlation_id": correlation_id, "operation_name": "summarize"},
-    )
-    body = SummarizeResponse(
-        summary=summary_str,
-        technologies=result.get("technologies") or [],
-        structure=structure_str,
-    )
-    body_bytes = json.dumps(
-        body.model_dump(),
-        indent=2,
-        ensure_ascii=False,
-    ).encode("utf-8")
-    return Response(
-        content=body_bytes,
-        media_type="application/json",
-        status_code=200,
-        headers={"X-Correlation-ID": correlation_id},
-    )
+    _response_cache.put(cache_key, result)
+    if revision_key is not None:
+        _response_cache.put(revision_key, result)
+    return result, "MISS", None
@@ -0,0 +1,17 @@
+"""Plain data types shared across modules; standard library only.
+
+Kept free of HTTP/retry dependencies so process-pool workers that unpickle these
+objects (e.g. for process_repo_files) do not import httpx, tenacity, or circuitbreaker.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class RepoFile:
+    """A single file in the repository: path (relative to repo root) and decoded content."""
+
+    path: str
+    content: str
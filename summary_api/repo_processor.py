@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
+import heapq
 import re
+from functools import lru_cache
 from typing import List, Sequence
 
-from .github_client import RepoFile
+from .models import RepoFile
 
 # Default context size: ~60k chars leaves room for prompt + response in typical 8k–32k context windows.
 DEFAULT_MAX_CONTEXT_CHARS = 60_000
 
+# Leading chars inspected by _looks_binary; enough to catch file headers without scanning whole blobs.
+BINARY_SNIFF_CHARS = 8192
+
+# Files listed per directory in the structure tree; large flat dirs (fixtures, generated code) are sampled.
+TREE_FILES_PER_DIR = 8
+
 # Directory names we skip (case-insensitive).
 SKIP_DIRS = frozenset({
     "node_modules", "__pycache__", ".git", "venv", ".venv", "env", ".env",
@@ -17,6 +25,12 @@ SKIP_DIRS = frozenset({
     "vendor", "pods", ".idea", ".vscode", "coverage", "htmlcov", ".nx", ".turbo",
 })
 
+# One pass over the whole path: any directory segment (not the file name) in SKIP_DIRS or *.egg-info.
+_SKIP_DIR_RE = re.compile(
+    r"(?:^|/)(?:" + "|".join(map(re.escape, sorted(SKIP_DIRS))) + r"|[^/]*\.egg-info)/(?=.*[^/])",
+    re.I,
+)
+
 # File name patterns to skip: lock files, minified, source maps, large binaries.
 SKIP_FILE_PATTERNS = (
     re.compile(r"\.(min\.(js|css))$", re.I),
@@ -29,52 +43,69 @@ SKIP_FILE_PATTERNS = (
     re.compile(r"composer\.lock$", re.I),
     re.compile(r"\.lock$", re.I),
 )
+# The same patterns as one alternation: a single regex search per file name instead of one per pattern.
+_SKIP_FILE_RE = re.compile("|".join(f"(?:{pat.pattern})" for pat in SKIP_FILE_PATTERNS), re.I)
 
 # High-priority files (included first): README, LICENSE, config at root or anywhere.
-PRIORITY_README = re.compile(r"^(readme|read_me|contributing|changelog)(\.[a-z0-9]+)?$", re.I)
-PRIORITY_LICENSE = re.compile(r"^license(\.[a-z0-9]+)?$", re.I)
+# Matched on the lowercased file name: the stem plus at most one alphanumeric extension (README, license.md).
+PRIORITY_DOC_STEMS = frozenset({"readme", "read_me", "contributing", "changelog", "license"})
 PRIORITY_CONFIG_NAMES = frozenset({
     "package.json", "pyproject.toml", "requirements.txt", "requirements-dev.txt",
     "setup.py", "setup.cfg", "Cargo.toml", "go.mod", "go.sum", "Makefile",
     "Dockerfile", "docker-compose.yml", "docker-compose.yaml",
     "tsconfig.json", "webpack.config.js", "CMakeLists.txt",
 })
+# Lowercased once for case-insensitive matching against file names in _file_priority.
+_PRIORITY_CONFIG_LOWER = frozenset(name.lower() for name in PRIORITY_CONFIG_NAMES)
 
 
 def _path_segments(path: str) -> List[str]:
-    """Return path segments (dirs + final file name)."""
-    return [p for p in path.replace("\\", "/").split("/") if p]
+    """Return path segments (dirs + final file name) of a forward-slash path."""
+    return [p for p in path.split("/") if p]
 
 
+@lru_cache(maxsize=8192)
 def should_skip_path(path: str) -> bool:
-    """Return True if this path should be skipped (binary dirs, lock files, etc.)."""
-    segments = _path_segments(path)
-    for seg in segments[:-1]:  # directories only
-        seg_lower = seg.lower()
-        if seg_lower in SKIP_DIRS:
-            return True
-        if seg_lower.endswith(".egg-info") or seg_lower == ".eggs":
-            return True
-    base = segments[-1] if segments else ""
-    for pat in SKIP_FILE_PATTERNS:
-        if pat.search(base):
-            return True
-    return False
+    """Return True if this path should be skipped (binary dirs, lock files, etc.).
+
+    Pure in path, so decisions are cached: repeat requests and common names (package-lock.json, ...) hit the cache.
+    """
+    normalized = path.replace("\\", "/")
+    if _SKIP_DIR_RE.search(normalized):
+        return True
+    base = normalized.rstrip("/").rsplit("/", 1)[-1]
+    return _SKIP_FILE_RE.search(base) is not None
+
 
+def _looks_binary(content: str) -> bool:
+    """Return True if decoded content is really binary (NUL chars, or mostly undecodable, near the start).
 
+    Downloads are decoded with errors="replace", so binary blobs served as text show up as NULs and U+FFFD.
+    """
+    if content.find("\x00", 0, BINARY_SNIFF_CHARS) != -1:
+        return True
+    window = min(len(content), BINARY_SNIFF_CHARS)
+    return content.count("\ufffd", 0, window) * 10 > window * 3
+
+
+@lru_cache(maxsize=8192)
 def _file_priority(path: str) -> int:
-    """Lower number = higher priority (included first when truncating)."""
+    """Lower number = higher priority (included first when truncating).
+
+    Cached like should_skip_path, so a path is split into segments once per worker process.
+    """
     segments = _path_segments(path)
     base = (segments[-1] or "").lower()
     dir_depth = len(segments) - 1
     # README / LICENSE at any depth: 0
-    if PRIORITY_README.match(base) or PRIORITY_LICENSE.match(base):
+    stem, dot, ext = base.partition(".")
+    if stem in PRIORITY_DOC_STEMS and (not dot or (ext.isascii() and ext.isalnum())):
         return 0
     # Root-level config: 1
-    if dir_depth == 0 and base in {s.lower() for s in PRIORITY_CONFIG_NAMES}:
+    if dir_depth == 0 and base in _PRIORITY_CONFIG_LOWER:
         return 1
     # Config files anywhere: 2
-    if base in {s.lower() for s in PRIORITY_CONFIG_NAMES}:
+    if base in _PRIORITY_CONFIG_LOWER:
         return 2
     # Root-level source/docs: 3
     if dir_depth <= 1:
@@ -83,25 +114,44 @@ def _file_priority(path: str) -> int:
     return 4 + min(dir_depth, 5)
 
 
-def _build_directory_tree(paths: List[str], max_entries: int = 200) -> str:
-    """Build a simple ASCII tree of paths for structure context."""
+def _build_directory_tree(
+    paths: List[str],
+    max_entries: int = 200,
+    max_per_dir: int = TREE_FILES_PER_DIR,
+) -> str:
+    """Build a simple ASCII tree of forward-slash paths for structure context.
+
+    At most max_per_dir files are listed per directory, so a few huge directories cannot use up
+    max_entries before the rest of the repository's layout is shown.
+    """
     if not paths:
         return "(no files)"
-    seen: set[str] = set()
+    per_dir: dict[str, int] = {}
+    sampled: List[str] = []
+    for p in sorted(paths):
+        parent = p.rpartition("/")[0]
+        count = per_dir.get(parent, 0)
+        if count < max_per_dir:
+            per_dir[parent] = count + 1
+            sampled.append(p)
+    # Sorted paths sharing a directory prefix are contiguous, so a directory line is needed only
+    # where a path's directories diverge from the previous path's.
     lines: List[str] = []
-    for p in sorted(paths)[:max_entries]:
-        parts = p.replace("\\", "/").split("/")
-        prefix = ""
-        for i, part in enumerate(parts[:-1]):
-            key = "/".join(parts[: i + 1])
-            if key not in seen:
-                seen.add(key)
-                lines.append(f"{prefix}{part}/")
-            prefix = prefix + "  "
-        file_part = parts[-1]
-        lines.append(f"{prefix}{file_part}")
-    if len(paths) > max_entries:
-        lines.append(f"... and {len(paths) - max_entries} more files")
+    prev_dirs: List[str] = []
+    for p in sampled[:max_entries]:
+        *dirs, file_part = p.split("/")
+        depth = 0
+        for prev, cur in zip(prev_dirs, dirs):
+            if prev != cur:
+                break
+            depth += 1
+        for level in range(depth, len(dirs)):
+            lines.append(f"{'  ' * level}{dirs[level]}/")
+        lines.append(f"{'  ' * len(dirs)}{file_part}")
+        prev_dirs = dirs
+    shown = min(len(sampled), max_entries)
+    if len(paths) > shown:
+        lines.append(f"... and {len(paths) - shown} more files")
     return "\n".join(lines)
 
 
@@ -111,37 +161,55 @@ def process_repo_files(
 ) -> str:
     """Filter, prioritize, and merge repo files into a single context string for the LLM.
 
-    - Skips: binary dirs (node_modules, __pycache__, .git, venv, ...), lock files, minified files.
+    - Skips: binary dirs (node_modules, __pycache__, .git, venv, ...), lock files, minified files,
+      and files whose content is binary (see _looks_binary).
     - Prioritizes: README, LICENSE, config files (package.json, pyproject.toml, ...), then source.
     - Enforces max_chars by truncating low-priority file contents and then dropping files.
 
     Returns:
         Single string: directory tree + key file contents, suitable for LLM context.
     """
+    # Single pass: filter, cap, and collect paths for the tree together
     filtered: List[RepoFile] = []
+    paths: List[str] = []
+    skip = should_skip_path
+    file_cap = max_chars // 3
     for f in files:
         path = f.path or ""
+        # Normalize separators once here; the tree and priority helpers assume forward slashes
+        if "\\" in path:
+            path = path.replace("\\", "/")
+        if skip(path):
+            continue
         content = f.content or ""
-        if should_skip_path(path):
+        if _looks_binary(content):
             continue
         # Cap single-file size to leave room for other files
-        if len(content) > max_chars // 3:
-            content = content[: max_chars // 3] + "\n\n[... truncated for context limit ...]"
+        if len(content) > file_cap:
+            content = content[:file_cap] + "\n\n[... truncated for context limit ...]"
+        elif path is f.path and content is f.content:
+            # Nothing to normalize: keep the caller's object instead of copying it
+            filtered.append(f)
+            paths.append(path)
+            continue
         filtered.append(RepoFile(path=path, content=content))
+        paths.append(path)
 
     if not filtered:
         return "Repository has no included text files (all skipped or empty)."
 
-    paths = [f.path for f in filtered]
     tree_section = "## Repository structure\n\n```\n" + _build_directory_tree(paths) + "\n```"
     parts: List[str] = [tree_section, "\n\n## Key files\n"]
     used = len(tree_section) + len("\n\n## Key files\n")
 
-    # Sort by priority, then by path
-    ordered = sorted(filtered, key=lambda f: (_file_priority(f.path), f.path))
+    # Priority, then path order (index keeps input order for duplicate paths). The budget runs out after
+    # a few hundred files at most, so heapify and pop lazily instead of sorting every filtered file.
+    heap = [(_file_priority(f.path), f.path, i) for i, f in enumerate(filtered)]
+    heapq.heapify(heap)
     omission_msg = "\n\n(Additional files omitted due to context limit.)"
 
-    for f in ordered:
+    while heap:
+        f = filtered[heapq.heappop(heap)[2]]
         if used + len(omission_msg) >= max_chars:
             parts.append(omission_msg)
             break
@@ -155,7 +223,34 @@ def process_repo_files(
             break
         if len(body) > remaining:
             body = body[:remaining] + "\n\n[... truncated ...]"
-        parts.append(header + body)
+        # Appended separately: header + body would copy each (possibly large) body before the final join
+        parts.append(header)
+        parts.append(body)
         used += len(header) + len(body)
 
     return "".join(parts)
+
+
+def trim_repo_files(
+    files: Sequence[RepoFile],
+    max_chars: int = DEFAULT_MAX_CONTEXT_CHARS,
+) -> List[RepoFile]:
+    """Drop files process_repo_files would skip and cut bodies to the part it can use.
+
+    process_repo_files(trim_repo_files(files)) == process_repo_files(files), but the trimmed list is
+    far smaller to pickle into a worker process: no single body exceeds max_chars // 3 + 1 chars
+    (one char past the per-file cap keeps the truncation marker), nor BINARY_SNIFF_CHARS.
+    """
+    keep_chars = max(max_chars // 3 + 1, BINARY_SNIFF_CHARS)
+    trimmed: List[RepoFile] = []
+    for f in files:
+        path = f.path or ""
+        if should_skip_path(path.replace("\\", "/")):
+            continue
+        content = f.content or ""
+        if _looks_binary(content):
+            continue
+        if len(content) > keep_chars:
+            f = RepoFile(path=f.path, content=content[:keep_chars])
+        trimmed.append(f)
+    return trimmed
@@ -0,0 +1,69 @@
+"""Tests for summary_api.cache: LRU/TTL behaviour and content-hash cache keys."""
+
+from unittest.mock import patch
+
+from summary_api.cache import TTLCache, content_key
+
+
+# --- TTLCache ---
+
+
+def test_ttl_cache_get_returns_stored_value() -> None:
+    """put then get returns the same value; unknown key returns None."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.put("a", {"summary": "A"})
+    assert cache.get("a") == {"summary": "A"}
+    assert cache.get("missing") is None
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    """When full, the least recently used entry is evicted."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expired_entry_is_missing() -> None:
+    """Entries older than ttl are treated as missing and dropped."""
+    cache = TTLCache(maxsize=2, ttl=10)
+    with patch("summary_api.cache.time.monotonic", return_value=100.0):
+        cache.put("a", 1)
+    with patch("summary_api.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_by_total_size() -> None:
+    """With maxbytes set, least recently used entries go until the sizes fit the budget."""
+    cache = TTLCache(maxsize=10, ttl=60, maxbytes=100)
+    cache.put("a", "A", size=60)
+    cache.put("b", "B", size=30)
+    cache.put("a", "A2", size=40)  # replacing an entry re-counts its size
+    assert cache.nbytes == 70
+    cache.put("c", "C", size=50)  # 120 > 100: "b" (least recently used) goes
+    assert cache.get("b") is None
+    assert cache.get("a") == "A2"
+    assert cache.get("c") == "C"
+    assert cache.nbytes == 90
+
+
+# --- content_key ---
+
+
+def test_content_key_is_order_independent() -> None:
+    """Same (path, content) pairs in a different order give the same key."""
+    files = [("README.md", "hello"), ("src/main.py", "print(1)")]
+    assert content_key(files, "model") == content_key(list(reversed(files)), "model")
+
+
+def test_content_key_changes_with_content_and_extra() -> None:
+    """Changing a file's content or an extra part (e.g. model) changes the key."""
+    base = content_key([("README.md", "hello")], "model-a")
+    assert content_key([("README.md", "hello!")], "model-a") != base
+    assert content_key([("README.md", "hello")], "model-b") != base
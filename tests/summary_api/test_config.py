@@ -16,6 +16,11 @@ def test_get_settings_returns_settings_instance() -> None:
     assert isinstance(settings, Settings), f"Expected Settings instance, got {type(settings)}"
 
 
+def test_get_settings_is_cached() -> None:
+    """get_settings() loads env once and returns the same instance on later calls."""
+    assert get_settings() is get_settings()
+
+
 def test_settings_nebius_api_key_is_secret_str() -> None:
     """NEBIUS_API_KEY is SecretStr type so it is not leaked in logs/repr."""
     settings = get_settings()
@@ -52,3 +57,10 @@ def test_settings_repr_does_not_contain_raw_key() -> None:
         repr_str = repr(settings)
         # Assert: raw value must not appear in repr
         assert "secret-key-xyz" not in repr_str, "API key must not appear in repr (SecretStr masking)"
+
+
+def test_settings_max_concurrent_summaries_from_env() -> None:
+    """MAX_CONCURRENT_SUMMARIES defaults to 8 and can be overridden from env."""
+    assert Settings().MAX_CONCURRENT_SUMMARIES >= 1
+    with patch.dict(os.environ, {"MAX_CONCURRENT_SUMMARIES": "2"}, clear=False):
+        assert Settings().MAX_CONCURRENT_SUMMARIES == 2
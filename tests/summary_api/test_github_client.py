@@ -1,14 +1,22 @@
 """Tests for summary_api.github_client: URL parsing, fetch, and error handling (real API when GITHUB_TOKEN set)."""
 
+import asyncio
 import os
+from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
 from summary_api.github_client import (
     GitHubClientError,
+    MAX_FILE_BYTES,
     RepoFile,
+    _conditional_get,
+    _etag_cache,
+    _get_file_content,
     _parse_github_url,
     fetch_repo_files,
+    fetch_repo_revision,
 )
 
 
@@ -65,6 +73,114 @@ def test_fetch_repo_files_invalid_url_raises() -> None:
     assert "Invalid GitHub URL" in (exc_info.value.message or str(exc_info.value))
 
 
+# --- fetch_repo_revision: HEAD SHA lookup (mock transport, no network) ---
+
+
+def _revision(url: str, handler) -> str | None:
+    async def _run() -> str | None:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_repo_revision(url, client=client)
+
+    return asyncio.run(_run())
+
+
+def test_fetch_repo_revision_returns_owner_repo_sha() -> None:
+    """HEAD SHA is requested as plain text and returned as lowercase owner/repo@sha."""
+    sha = "a" * 40
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/repos/Owner/Repo/commits/HEAD"
+        assert request.headers["Accept"] == "application/vnd.github.sha"
+        return httpx.Response(200, text=sha)
+
+    assert _revision("https://github.com/Owner/Repo", handler) == f"owner/repo@{sha}"
+
+
+@pytest.mark.parametrize("response", [httpx.Response(404), httpx.Response(200, text="<html>")])
+def test_fetch_repo_revision_returns_none_on_failure(response: httpx.Response) -> None:
+    """Not found or an unexpected body yields None instead of raising."""
+    assert _revision("https://github.com/o/r", lambda request: response) is None
+
+
+def test_fetch_repo_revision_invalid_url_returns_none() -> None:
+    """Invalid URLs return None; fetch_repo_files reports the error."""
+    assert _revision("https://gitlab.com/o/r", lambda request: httpx.Response(200)) is None
+
+
+def test_fetch_repo_revision_skips_github_while_fetch_circuit_open() -> None:
+    """With the fetch_repo_files circuit open, no lookup is sent (the fetch will fail fast)."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("no request expected while the circuit is open")
+
+    with patch("summary_api.github_client._fetch_circuit", MagicMock(opened=True)):
+        assert _revision("https://github.com/o/r", handler) is None
+
+
+def test_fetch_repo_revision_timeout_returns_none() -> None:
+    """A slow lookup times out and yields None instead of holding the request."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.extensions["timeout"]["read"] == 3.0
+        raise httpx.ReadTimeout("slow", request=request)
+
+    assert _revision("https://github.com/o/r", handler) is None
+
+
+# --- _conditional_get: ETag revalidation (mock transport, no network) ---
+
+
+def test_conditional_get_reuses_body_on_304() -> None:
+    """Second GET sends If-None-Match and a 304 returns the first decoded body, charged by size."""
+    _etag_cache.clear()
+    seen: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="body", headers={"ETag": '"v1"'})
+
+    async def _run() -> tuple[str, str]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            first = await _conditional_get(client, "https://example.test/f", {}, lambda resp: resp.text)
+            second = await _conditional_get(client, "https://example.test/f", {}, lambda resp: resp.text)
+            return first, second
+
+    assert asyncio.run(_run()) == ("body", "body")
+    assert seen == [None, '"v1"']
+    assert _etag_cache.nbytes == len(b"body")
+
+
+# --- _get_file_content: streamed, capped download (mock transport, no network) ---
+
+
+def _file_content(response: httpx.Response) -> str | None:
+    async def _run() -> str | None:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(lambda request: response)) as client:
+            return await _get_file_content(client, "https://raw.example.test/big.txt", {})
+
+    return asyncio.run(_run())
+
+
+def test_get_file_content_stops_at_max_file_bytes() -> None:
+    """Bodies larger than MAX_FILE_BYTES are cut at the cap."""
+    text = _file_content(httpx.Response(200, text="a" * (MAX_FILE_BYTES + 1000)))
+    assert text == "a" * MAX_FILE_BYTES
+
+
+def test_get_file_content_binary_returns_none() -> None:
+    """Image / octet-stream responses are skipped."""
+    assert _file_content(httpx.Response(200, content=b"\x89PNG", headers={"content-type": "image/png"})) is None
+
+
+def test_get_file_content_charges_etag_cache_in_body_bytes() -> None:
+    """Streamed bodies count against the ETag cache budget in raw bytes, like _conditional_get."""
+    _etag_cache.clear()
+    body = "héllo wörld".encode("utf-8")
+    response = httpx.Response(200, content=body, headers={"ETag": '"v1"', "content-type": "text/plain; charset=utf-8"})
+    assert _file_content(response) == "héllo wörld"
+    assert _etag_cache.nbytes == len(body)
+
+
 # --- fetch_repo_files: real API (require GITHUB_TOKEN) ---
 
 def _github_token() -> str | None:
@@ -1,14 +1,19 @@
 """Tests for summary_api.llm_client: API key from caller, parsing, and error handling (mocked HTTP)."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
 from summary_api.llm_client import (
+    USER_PROMPT_TEMPLATE,
     LLMClientError,
+    _build_messages,
     _parse_structured_response,
+    create_http_client,
     summarize_repo,
+    summarize_repos,
 )
 
 
@@ -25,6 +30,16 @@ def test_summarize_repo_missing_api_key_raises() -> None:
         summarize_repo("context", api_key="   ")
 
 
+# --- Prompt messages ---
+
+
+def test_build_messages_user_content_matches_template() -> None:
+    """User message equals the formatted template, also for contexts containing braces."""
+    context = 'def f(): return {"a": 1}'
+    messages = _build_messages(context)
+    assert messages[1]["content"] == USER_PROMPT_TEMPLATE.format(context=context)
+
+
 # --- Parsing: structured output ---
 
 
@@ -63,6 +78,13 @@ def test_parse_structured_response_partial_dict() -> None:
     assert out["structure"] == ""
 
 
+def test_parse_structured_response_drops_non_string_technologies() -> None:
+    """Non-string entries in technologies are dropped; string order is kept."""
+    raw = '{"summary": "S", "technologies": ["Python", 3, null, "Docker"], "structure": ""}'
+    out = _parse_structured_response(raw)
+    assert out["technologies"] == ["Python", "Docker"]
+
+
 # --- HTTP errors: 401, 429, timeout ---
 
 
@@ -138,3 +160,60 @@ def test_summarize_repo_success_nebius_returns_three_fields() -> None:
         assert result["structure"] == "src/ and tests/."
 
 
+def test_summarize_repo_shared_client_with_bound_key_sends_auth_header() -> None:
+    """A client created with api_key authenticates calls without a per-request header."""
+    seen: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("Authorization"))
+        content = '{"summary": "S", "technologies": [], "structure": ""}'
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+    async def _run() -> dict:
+        bound = create_http_client(api_key="bound-key")
+        assert bound.headers["Authorization"] == "Bearer bound-key"
+        await bound.aclose()
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport, headers={"Authorization": "Bearer bound-key"}) as client:
+            return await summarize_repo("ctx", api_key="bound-key", client=client)
+
+    assert asyncio.run(_run())["summary"] == "S"
+    assert seen == ["Bearer bound-key"]
+
+
+# --- Batch: several contexts, results in input order ---
+
+
+def test_summarize_repos_returns_results_in_input_order() -> None:
+    """summarize_repos calls summarize_repo per context and keeps the input order."""
+
+    async def fake_summarize(context: str, **_kwargs: object) -> dict:
+        await asyncio.sleep(0.01 if context == "first" else 0)
+        return {"summary": context, "technologies": [], "structure": ""}
+
+    with patch("summary_api.llm_client.summarize_repo", new=AsyncMock(side_effect=fake_summarize)) as mock_one:
+        results = asyncio.run(
+            summarize_repos(["first", "second", "third"], api_key="fake-key", max_concurrency=2)
+        )
+    assert [r["summary"] for r in results] == ["first", "second", "third"]
+    assert mock_one.await_count == 3
+
+
+def test_summarize_repos_failure_raises_and_cancels_pending_calls() -> None:
+    """The first failing call is raised as is; calls still in flight are cancelled, not left running."""
+    cancelled: list[str] = []
+
+    async def fake_summarize(context: str, **_kwargs: object) -> dict:
+        if context == "bad":
+            raise LLMClientError("LLM API server error: 500.")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(context)
+            raise
+        return {"summary": context, "technologies": [], "structure": ""}
+
+    with patch("summary_api.llm_client.summarize_repo", new=AsyncMock(side_effect=fake_summarize)):
+        with pytest.raises(LLMClientError, match="server error"):
+            asyncio.run(summarize_repos(["slow", "bad", "queued"], api_key="fake-key", max_concurrency=2))
+    assert "slow" in cancelled
@@ -1,11 +1,27 @@
 """Targeted tests for summary_api.main: root and POST /summarize endpoints (real GitHub + LLM when tokens set)."""
 
+import asyncio
+import json
 import os
 
 import pytest
 from fastapi.testclient import TestClient
 
-from summary_api.main import app
+from summary_api.github_client import GitHubClientError
+from summary_api.llm_client import LLMClientError
+from summary_api.main import (
+    CORRELATION_ID_BATCH,
+    _error_body,
+    _github_error_to_status_and_message,
+    _llm_error_to_status_and_message,
+    _next_correlation_id,
+    _run_cpu_bound,
+    _single_flight,
+    _submit_audit,
+    _success_response,
+    app,
+)
+from summary_api.schemas import ErrorResponse, SummarizeResponse
 
 client = TestClient(app)
 
@@ -73,6 +89,20 @@ def test_summarize_missing_github_url_returns_400_and_error_body() -> None:
     assert "message" in data
 
 
+def test_responses_carry_distinct_correlation_ids() -> None:
+    """Every response, including validation errors, has its own X-Correlation-ID."""
+    ids = [client.get("/").headers["X-Correlation-ID"], client.post("/summarize", json={}).headers["X-Correlation-ID"]]
+    assert all(len(i) == 32 for i in ids)
+    assert ids[0] != ids[1]
+
+
+def test_well_formed_x_request_id_is_reused() -> None:
+    """An upstream X-Request-ID becomes the correlation id; a malformed one is replaced."""
+    assert client.get("/", headers={"X-Request-ID": "edge-42.a"}).headers["X-Correlation-ID"] == "edge-42.a"
+    replaced = client.get("/", headers={"X-Request-ID": "bad id\""}).headers["X-Correlation-ID"]
+    assert len(replaced) == 32 and replaced != "bad id\""
+
+
 def test_summarize_github_url_not_string_returns_400_and_error_body() -> None:
     """POST /summarize with github_url not a string (e.g. number) returns 400 and spec error body."""
     response = client.post("/summarize", json={"github_url": 123})
@@ -125,3 +155,171 @@ def test_summarize_nonexistent_repo_returns_404_and_error_body() -> None:
     data = response.json()
     assert data.get("status") == "error"
     assert "message" in data
+
+
+# --- Error classification: (status, message) per upstream error ---
+
+
+@pytest.mark.parametrize(
+    "message,expected_status",
+    [
+        ("Invalid GitHub URL: must be https://github.com/owner/repo", 400),
+        ("Repository not found or private", 404),
+        ("Request to GitHub timed out", 502),
+        ("Network error: connection reset", 502),
+        ("GitHub API rate limit or access denied", 503),
+        ("GitHub API error: 403 Forbidden", 503),
+        ("GitHub API error: 403 Not Found", 404),
+        ("GitHub API error: 500 boom", 502),
+    ],
+)
+def test_github_error_to_status(message: str, expected_status: int) -> None:
+    """GitHub errors map to status by message, checked in priority order."""
+    status, msg = _github_error_to_status_and_message(GitHubClientError(message))
+    assert status == expected_status
+    assert msg == message
+
+
+@pytest.mark.parametrize(
+    "message,expected_status",
+    [
+        ("LLM API authentication failed (invalid or missing API key).", 401),
+        ("LLM API key is not configured. Set NEBIUS_API_KEY in the environment.", 401),
+        ("LLM API rate limit exceeded. Try again later.", 429),
+        ("LLM API request timed out: read timeout", 502),
+        ("LLM API server error: 500.", 502),
+    ],
+)
+def test_llm_error_to_status(message: str, expected_status: int) -> None:
+    """LLM errors map to 401 auth, 429 rate limit, else 502."""
+    status, msg = _llm_error_to_status_and_message(LLMClientError(message))
+    assert status == expected_status
+    assert msg == message
+
+
+def test_error_body_matches_error_response_schema() -> None:
+    """_error_body has the same shape as ErrorResponse.model_dump()."""
+    assert _error_body("boom") == ErrorResponse(status="error", message="boom").model_dump()
+
+
+def test_success_response_body_matches_summarize_response_schema() -> None:
+    """_success_response streams the SummarizeResponse shape with Content-Length and cache header."""
+    result = {"summary": "S", "technologies": ["Python"], "structure": "src/"}
+    response = _success_response(result, cache_status="MISS")
+
+    async def _collect() -> bytes:
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    body = asyncio.run(_collect())
+    assert json.loads(body) == SummarizeResponse(**result).model_dump()
+    assert response.headers["Content-Length"] == str(len(body))
+    assert response.headers["X-Cache"] == "MISS"
+
+
+def test_next_correlation_id_unique_hex_across_refills() -> None:
+    """Correlation ids are 32 hex chars and unique, also across pool refills."""
+    ids = [_next_correlation_id() for _ in range(CORRELATION_ID_BATCH * 2 + 1)]
+    assert all(len(i) == 32 and int(i, 16) >= 0 for i in ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_single_flight_runs_work_once_for_concurrent_callers() -> None:
+    """Concurrent callers with the same key share one run; only the leader is not marked shared."""
+    calls = 0
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def _run() -> list:
+        return await asyncio.gather(*(_single_flight("repo@sha:model", work) for _ in range(5)))
+
+    outcomes = asyncio.run(_run())
+    assert calls == 1
+    assert [o[0] for o in outcomes] == ["result"] * 5
+    assert sorted(o[1] for o in outcomes) == [False, True, True, True, True]
+
+
+def test_single_flight_cancelled_leader_does_not_cancel_followers() -> None:
+    """Cancelling the leader's request leaves the shared run going: the follower still gets its result."""
+    calls = 0
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def _run() -> tuple[str, bool]:
+        leader = asyncio.create_task(_single_flight("repo@sha:model", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(_single_flight("repo@sha:model", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(_run()) == ("result", True)
+    assert calls == 1
+
+
+def test_single_flight_cancels_run_when_last_caller_leaves() -> None:
+    """With no caller left waiting, the run is cancelled instead of running on outside summary_slots."""
+    cancelled = False
+
+    async def work() -> str:
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return "result"
+
+    async def _run() -> None:
+        leader = asyncio.create_task(_single_flight("repo@sha:model", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        await asyncio.sleep(0)
+
+    asyncio.run(_run())
+    assert cancelled
+
+
+def test_run_cpu_bound_falls_back_to_thread_when_pool_cannot_start() -> None:
+    """A pool whose workers fail to start (RuntimeError on submit) is dropped; the call still returns."""
+
+    class _UnstartablePool:
+        def submit(self, *_args: object, **_kwargs: object) -> None:
+            raise RuntimeError("An attempt has been made to start a new process before the current process has finished its bootstrapping phase.")
+
+        def shutdown(self, *_args: object, **_kwargs: object) -> None: ...
+
+    app.state.cpu_pool = _UnstartablePool()
+    try:
+        assert asyncio.run(_run_cpu_bound(sum, [1, 2, 3])) == 6
+        assert app.state.cpu_pool is None
+    finally:
+        del app.state.cpu_pool
+
+
+def test_submit_audit_drops_oldest_entry_when_queue_full() -> None:
+    """A full audit queue keeps the newest entries: the oldest is dropped to make room."""
+    def first() -> None: ...
+
+    def second() -> None: ...
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    app.state.audit_queue = queue
+    try:
+        _submit_audit(first)
+        _submit_audit(second)
+    finally:
+        del app.state.audit_queue
+    assert queue.qsize() == 1
+    assert queue.get_nowait()[0] is second
@@ -5,8 +5,12 @@ import pytest
 from summary_api.github_client import RepoFile
 from summary_api.repo_processor import (
     DEFAULT_MAX_CONTEXT_CHARS,
+    TREE_FILES_PER_DIR,
+    _build_directory_tree,
+    _file_priority,
     process_repo_files,
     should_skip_path,
+    trim_repo_files,
 )
 
 
@@ -58,6 +62,23 @@ def test_should_skip_path_included(path: str) -> None:
     assert should_skip_path(path) is False
 
 
+def test_should_skip_path_caches_decisions() -> None:
+    """Repeated paths are answered from the cache with the same result."""
+    should_skip_path.cache_clear()
+    assert should_skip_path("node_modules/x/index.js") is True
+    assert should_skip_path("node_modules/x/index.js") is True
+    assert should_skip_path.cache_info().hits == 1
+
+
+def test_file_priority_caches_per_path() -> None:
+    """Priorities are computed once per path; README ranks before nested source."""
+    _file_priority.cache_clear()
+    assert _file_priority("docs/README.md") == 0
+    assert _file_priority("docs/README.md") == 0
+    assert _file_priority("src/pkg/mod.py") > _file_priority("pyproject.toml")
+    assert _file_priority.cache_info().hits == 1
+
+
 # --- process_repo_files: output is string, under limit ---
 
 
@@ -78,6 +99,19 @@ def test_process_repo_files_all_skipped_returns_message() -> None:
     assert "no included" in out or "skipped" in out.lower()
 
 
+def test_process_repo_files_skips_binary_content() -> None:
+    """Files whose content is binary (NULs or mostly undecodable) are left out of the context."""
+    files = [
+        RepoFile(path="assets/logo", content="\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"),
+        RepoFile(path="data/blob", content="\ufffd" * 50 + "ab"),
+        RepoFile(path="src/app.py", content="print('hi')"),
+    ]
+    out = process_repo_files(files)
+    assert "src/app.py" in out
+    assert "logo" not in out
+    assert "blob" not in out
+
+
 def test_process_repo_files_mock_output_has_structure_and_key_files() -> None:
     """Output includes repository structure and key files sections."""
     files = [
@@ -93,6 +127,15 @@ def test_process_repo_files_mock_output_has_structure_and_key_files() -> None:
     assert "def main(): pass" in out
 
 
+def test_build_directory_tree_samples_large_directories() -> None:
+    """A huge flat directory is sampled so sibling directories still appear in the tree."""
+    paths = [f"fixtures/case_{i:03d}.json" for i in range(500)] + ["src/app.py"]
+    tree = _build_directory_tree(paths)
+    assert tree.count("case_") == TREE_FILES_PER_DIR
+    assert "app.py" in tree
+    assert tree.endswith(f"... and {500 - TREE_FILES_PER_DIR} more files")
+
+
 def test_process_repo_files_respects_max_chars() -> None:
     """Output length does not exceed max_chars (volume limit)."""
     big = "x" * 10_000
@@ -130,3 +173,18 @@ def test_process_repo_files_priority_readme_first() -> None:
     deep_pos = out.find("deep/nested/file.py")
     assert readme_pos < deep_pos
     assert pyproject_pos < deep_pos
+
+
+def test_trim_repo_files_keeps_process_output_and_shrinks_bodies() -> None:
+    """Trimming before the worker drops skipped/binary files and long tails without changing the context."""
+    files = [
+        RepoFile(path="README.md", content="Root readme."),
+        RepoFile(path="node_modules/x/index.js", content="skip me"),
+        RepoFile(path="assets/logo", content="\x89PNG\x00\x00"),
+        RepoFile(path="src/big.py", content="y = 1\n" * 20_000),
+    ]
+    for max_chars in (DEFAULT_MAX_CONTEXT_CHARS, 3_000):
+        trimmed = trim_repo_files(files, max_chars=max_chars)
+        assert [f.path for f in trimmed] == ["README.md", "src/big.py"]
+        assert len(trimmed[1].content) < len(files[3].content)
+        assert process_repo_files(trimmed, max_chars=max_chars) == process_repo_files(files, max_chars=max_chars)